@@ -3,9 +3,19 @@ import json
 import os
 import sys
 import argparse
+import time
+import gzip
+import base64
+import copy
+import itertools
+import collections.abc
+import concurrent.futures
 import webbrowser
 import http.server
 import socketserver
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
 
 # --- put your own cookie values here, or you will be prompted on the command line---
 SWID = "YOUR_SWID_HERE"
@@ -14,6 +24,31 @@ ONESITE_TOKEN = "YOUR_TOKEN_HERE"
 
 MEMBER_FILE = "member_data.json"
 WEEKS_FILE = "all_weeks_data.json"
+STATS_FILE = "stats_output.json"
+HTML_EXPORT_FILE = "betkeeper_dashboard.html"
+EVENT_LOG_FILE = "pick_events.jsonl"
+CHECKPOINT_FILE = "pick_events.checkpoint.json"
+HISTORY_FILE = "pick_events.history.jsonl"
+
+# Dashboard template and vendored chart renderer used by --export-html
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD_TEMPLATE = os.path.join(BASE_DIR, "dashboard.html")
+# Pinned, minified Chart.js UMD build inlined by export_html; keep in step with the CDN tag
+CHART_LIBRARY = os.path.join(BASE_DIR, "vendor", "chart.umd.min.js")
+CHART_CDN_TAG = '<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>'
+MAX_CHART_POINTS = 100
+
+# Analytics daemon response cache budget
+DAEMON_CACHE_BYTES = 64 * 1024 * 1024
+
+# Base URL of the ESPN gambit API. Point this (or --api-base) at mock_espn_api.py for offline runs.
+API_BASE_URL = os.environ.get("BETKEEPER_API_BASE", "https://gambit-api.fantasy.espn.com/apis/v1")
+CHALLENGE_ID = 265
+
+# Retry policy for throttled (429) and server-error (5xx) responses
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
 
 
 def get_credentials():
@@ -51,12 +86,51 @@ def get_credentials():
         print("\n\nExiting...")
         sys.exit(0)
 
+def get_with_retry(url, cookies, session=None):
+    """
+    GET a URL, retrying timeouts, connection errors, throttled (429) and
+    server-error (5xx) responses.
+
+    Waits for the Retry-After header when present, otherwise backs off
+    exponentially. Any other error status is returned to the caller; a
+    timeout or connection error on the last attempt is re-raised.
+    """
+    getter = session.get if session is not None else requests.get
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = getter(url, cookies=cookies, timeout=REQUEST_TIMEOUT)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_BACKOFF * (2 ** attempt)
+            print(f"  {type(e).__name__} from API, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})...")
+            time.sleep(delay)
+            continue
+        
+        if response.status_code != 429 and response.status_code < 500:
+            return response
+        if attempt == MAX_RETRIES:
+            return response
+        
+        retry_after = response.headers.get("Retry-After")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = RETRY_BACKOFF * (2 ** attempt)
+        
+        print(f"  {response.status_code} from API, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})...")
+        time.sleep(delay)
+    
+    return response
+
+
 def fetch_member_data(cookies):
     """Fetch member picks data from ESPN API."""
-    url = "https://gambit-api.fantasy.espn.com/apis/v1/challenges/265/members/?platform=chui&view=chui_default"
+    url = f"{API_BASE_URL}/challenges/{CHALLENGE_ID}/members/?platform=chui&view=chui_default"
     
     try:
-        response = requests.get(url, cookies=cookies)
+        response = get_with_retry(url, cookies)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -83,7 +157,7 @@ def fetch_member_data(cookies):
                 "ESPN-ONESITE.WEB-PROD.token": ONESITE_TOKEN
             }
             print("\nRetrying with new credentials...\n")
-            response = requests.get(url, cookies=new_cookies)
+            response = get_with_retry(url, new_cookies)
             response.raise_for_status()
             return response.json()
         else:
@@ -91,14 +165,16 @@ def fetch_member_data(cookies):
 
 def fetch_weeks_data(completed_weeks, cookies):
     """Fetch game data for all completed weeks."""
-    url_template = "https://gambit-api.fantasy.espn.com/apis/v1/challenges/265/?scoringPeriodId={p}&view=chui_challenge_matchups&platform=chui"
+    url_template = f"{API_BASE_URL}/challenges/{CHALLENGE_ID}/?scoringPeriodId={{p}}&view=chui_challenge_matchups&platform=chui"
     all_weeks_data = {}
     
-    for week in completed_weeks:
-        url = url_template.format(p=week)
-        response = requests.get(url, cookies=cookies)
-        response.raise_for_status()
-        all_weeks_data[week] = response.json()
+    # Reuse one connection for every week
+    with requests.Session() as session:
+        for week in completed_weeks:
+            url = url_template.format(p=week)
+            response = get_with_retry(url, cookies, session)
+            response.raise_for_status()
+            all_weeks_data[week] = response.json()
     
     return all_weeks_data
 
@@ -215,43 +291,182 @@ def calculate_profit(pick, all_weeks_data, bet_amount=100):
         return -bet_amount
 
 
-def analyze_picks(member, all_weeks_data, bet_amount=100):
-    """Analyze all picks and calculate statistics."""
-    all_picks = member["entries"][0]["picks"]
-    
-    wins = 0
-    losses = 0
-    total_profit = 0
-    total_winnings = 0
-    total_losses = 0
-    
-    for pick in all_picks:
-        profit = calculate_profit(pick, all_weeks_data, bet_amount)
-        
-        if profit is None:
+def normalize_week(week):
+    """Return a week as an int whether it is a fetched int or a JSON string key."""
+    return int(week) if str(week).isdigit() else week
+
+
+def build_proposition_index(all_weeks_data):
+    """Map each proposition id to its (week, proposition) pair."""
+    index = {}
+    for week_num, week_data in all_weeks_data.items():
+        week = normalize_week(week_num)
+        for prop in week_data["propositions"]:
+            if prop["id"] not in index:
+                index[prop["id"]] = (week, prop)
+    return index
+
+
+def get_betting_line(outcome):
+    """Return the BETTING_LINE mapping value of an outcome, or None."""
+    for mapping in outcome["mappings"]:
+        if mapping["type"] == "BETTING_LINE":
+            return mapping["value"]
+    return None
+
+
+def get_pick_count(outcome):
+    """Return how many league members picked an outcome, or None if the payload has no counts."""
+    counters = outcome.get("choiceCounters")
+    if not counters:
+        return None
+    return sum(counter.get("count", 0) for counter in counters)
+
+
+def line_payout(line):
+    """Profit of a winning one-unit bet at the given American line."""
+    if line < 0:
+        return 100 / abs(line)
+    return line / 100
+
+
+def resolve_picks(member, all_weeks_data, entry_index=0, first_pick=0, prop_index=None):
+    """
+    Resolve every pick of an entry against the weeks data in one pass.
+
+    Each resolved pick carries its position in the entry's pick list, its
+    week, betting line, result and the profit of a one-unit stake, plus the
+    lines of the other outcomes and the picked outcome's share of league
+    picks when the matchup data has pick counts. Picks without a matching
+    proposition, outcome or betting line are dropped, just like
+    calculate_profit does. `first_pick` skips the picks before that
+    position, and a prebuilt build_proposition_index result can be passed
+    as `prop_index`.
+    """
+    if prop_index is None:
+        prop_index = build_proposition_index(all_weeks_data)
+    picks = member["entries"][entry_index]["picks"]
+    resolved = []
+
+    for pick_index in range(first_pick, len(picks)):
+        pick = picks[pick_index]
+        your_outcome_id = pick['outcomesPicked'][0]['outcomeId']
+        your_result = pick['outcomesPicked'][0]['result']
+
+        found = prop_index.get(pick['propositionId'])
+        if not found:
             continue
-        
-        total_profit += profit
-        
-        if profit > 0:
-            wins += 1
-            total_winnings += profit
-        else:
-            losses += 1
-            total_losses += abs(profit)
-    
+        week, matching_prop = found
+
+        your_team = None
+        for outcome in matching_prop["possibleOutcomes"]:
+            if outcome["id"] == your_outcome_id:
+                your_team = outcome
+                break
+
+        if not your_team:
+            continue
+
+        betting_line = get_betting_line(your_team)
+        if not betting_line:
+            continue
+
+        line = int(betting_line)
+        won = your_result == "CORRECT"
+
+        other_lines = []
+        for outcome in matching_prop["possibleOutcomes"]:
+            other_line = get_betting_line(outcome) if outcome is not your_team else None
+            if other_line:
+                other_lines.append(int(other_line))
+
+        counts = [get_pick_count(outcome) for outcome in matching_prop["possibleOutcomes"]]
+        total_count = sum(c for c in counts if c is not None)
+        your_count = get_pick_count(your_team)
+
+        resolved.append({
+            'pick_index': pick_index,
+            'proposition_id': pick['propositionId'],
+            'week': week,
+            'line': line,
+            'result': your_result,
+            'won': won,
+            'unit_profit': line_payout(line) if won else -1,
+            'other_lines': other_lines,
+            'pick_share': your_count / total_count if your_count is not None and total_count > 0 else None
+        })
+
+    return resolved
+
+
+def new_flat_totals():
+    """Create empty one-unit-stake sums for the flat-stake statistics."""
+    return {'wins': 0, 'losses': 0, 'unit_winnings': 0, 'unit_losses': 0,
+            'losing_picks': 0, 'biggest_win': None, 'biggest_loss': None}
+
+
+def add_flat_pick(totals, pick):
+    """Add one resolved pick to the flat-stake sums."""
+    unit_profit = pick['unit_profit']
+
+    if unit_profit > 0:
+        totals['wins'] += 1
+        totals['unit_winnings'] += unit_profit
+    else:
+        totals['losses'] += 1
+        totals['unit_losses'] += abs(unit_profit)
+    if unit_profit < 0:
+        totals['losing_picks'] += 1
+
+    if totals['biggest_win'] is None or unit_profit > totals['biggest_win']:
+        totals['biggest_win'] = unit_profit
+    if totals['biggest_loss'] is None or unit_profit < totals['biggest_loss']:
+        totals['biggest_loss'] = unit_profit
+
+
+def flat_stats_from_totals(totals, bet_amount=100):
+    """Turn flat-stake sums into the analyze_picks stats dict for a stake."""
+    wins = totals['wins']
+    losses = totals['losses']
+    unit_winnings = totals['unit_winnings']
+    unit_losses = totals['unit_losses']
+    losing_picks = totals['losing_picks']
+    total = wins + losses
+    unit_net = unit_winnings - unit_losses
+
     return {
-        "total_picks": wins + losses,
+        "total_picks": total,
         "wins": wins,
         "losses": losses,
-        "win_rate": wins / (wins + losses) * 100 if (wins + losses) > 0 else 0,
-        "total_winnings": total_winnings,
-        "total_losses": total_losses,
-        "net_profit": total_profit,
-        "roi": (total_profit / (bet_amount * (wins + losses))) * 100 if (wins + losses) > 0 else 0
+        "win_rate": wins / total * 100 if total > 0 else 0,
+        "total_winnings": unit_winnings * bet_amount,
+        "total_losses": unit_losses * bet_amount,
+        "net_profit": unit_net * bet_amount,
+        "roi": (unit_net / total) * 100 if total > 0 else 0,
+        "avg_win": unit_winnings * bet_amount / wins if wins else 0,
+        "avg_loss": -unit_losses * bet_amount / losing_picks if losing_picks else 0,
+        "biggest_win": totals['biggest_win'] * bet_amount if total else 0,
+        "biggest_loss": totals['biggest_loss'] * bet_amount if total else 0
     }
 
 
+def summarize_flat_stats(resolved, bet_amount=100):
+    """Calculate flat-stake statistics from resolved picks."""
+    totals = new_flat_totals()
+    for pick in resolved:
+        add_flat_pick(totals, pick)
+
+    return flat_stats_from_totals(totals, bet_amount)
+
+
+def analyze_picks(member, all_weeks_data, bet_amount=100, resolved=None):
+    """Analyze all picks and calculate statistics."""
+    if resolved is None:
+        resolved = resolve_picks(member, all_weeks_data)
+
+    return summarize_flat_stats(resolved, bet_amount)
+
+
 def print_summary(stats):
     """Print summary statistics."""
     print("\n" + "=" * 70)
@@ -270,503 +485,1082 @@ def print_summary(stats):
     print("=" * 70)
 
 
-def calculate_line_range_stats(member, all_weeks_data, bet_amount=100):
-    """Calculate performance by betting line ranges."""
-    line_ranges = {
-        'heavy_favorites': {'range': '≤ -200', 'min': -9999, 'max': -200, 'wins': 0, 'losses': 0, 'profit': 0},
-        'favorites': {'range': '-199 to -110', 'min': -199, 'max': -110, 'wins': 0, 'losses': 0, 'profit': 0},
-        'slight_underdogs': {'range': '+110 to +199', 'min': 110, 'max': 199, 'wins': 0, 'losses': 0, 'profit': 0},
-        'big_underdogs': {'range': '≥ +200', 'min': 200, 'max': 9999, 'wins': 0, 'losses': 0, 'profit': 0}
+LINE_RANGES = {
+    'heavy_favorites': {'range': '≤ -200', 'min': -9999, 'max': -200},
+    'favorites': {'range': '-199 to -110', 'min': -199, 'max': -110},
+    'slight_underdogs': {'range': '+110 to +199', 'min': 110, 'max': 199},
+    'big_underdogs': {'range': '≥ +200', 'min': 200, 'max': 9999}
+}
+
+
+def line_range_category(line):
+    """Return the LINE_RANGES category of an American line, or None if it fits none."""
+    for category, data in LINE_RANGES.items():
+        if line < 0:  # Favorites
+            if data['max'] < 0 and data['min'] <= line <= data['max']:
+                return category
+        else:  # Underdogs
+            if data['min'] > 0 and data['min'] <= line <= data['max']:
+                return category
+    return None
+
+
+def new_line_range_totals():
+    """Create empty per-category sums for calculate_line_range_stats."""
+    return {
+        category: dict(data, wins=0, losses=0, profit=0)
+        for category, data in LINE_RANGES.items()
     }
+
+
+def add_line_range_pick(line_ranges, pick, bet_amount=100):
+    """Add one resolved pick to the sums of its line range, if it has one."""
+    profit = pick['unit_profit'] * bet_amount
     
-    all_picks = member["entries"][0]["picks"]
+    # Categorize by line range
+    category = line_range_category(pick['line'])
+    if category is None:
+        return
     
-    for pick in all_picks:
-        profit = calculate_profit(pick, all_weeks_data, bet_amount)
-        if profit is None:
-            continue
-        
-        your_outcome_id = pick['outcomesPicked'][0]['outcomeId']
-        prop_id = pick['propositionId']
-        
-        matching_prop = None
-        for week_data in all_weeks_data.values():
-            for prop in week_data["propositions"]:
-                if prop["id"] == prop_id:
-                    matching_prop = prop
-                    break
-            if matching_prop:
-                break
-        
-        if not matching_prop:
-            continue
-        
-        your_team = None
-        for outcome in matching_prop["possibleOutcomes"]:
-            if outcome["id"] == your_outcome_id:
-                your_team = outcome
-                break
-        
-        if not your_team:
-            continue
-        
-        betting_line = None
-        for mapping in your_team["mappings"]:
-            if mapping["type"] == "BETTING_LINE":
-                betting_line = mapping["value"]
-                break
-        
-        if not betting_line:
-            continue
-        
-        line = int(betting_line)
-        
-        # Categorize by line range
-        for category, data in line_ranges.items():
-            if line < 0:  # Favorites
-                if data['max'] < 0 and data['min'] <= line <= data['max']:
-                    data['profit'] += profit
-                    if profit > 0:
-                        data['wins'] += 1
-                    else:
-                        data['losses'] += 1
-                    break
-            else:  # Underdogs
-                if data['min'] > 0 and data['min'] <= line <= data['max']:
-                    data['profit'] += profit
-                    if profit > 0:
-                        data['wins'] += 1
-                    else:
-                        data['losses'] += 1
-                    break
+    data = line_ranges[category]
+    data['profit'] += profit
+    if profit > 0:
+        data['wins'] += 1
+    else:
+        data['losses'] += 1
+
+
+def calculate_line_range_stats(member, all_weeks_data, bet_amount=100, resolved=None):
+    """Calculate performance by betting line ranges."""
+    line_ranges = new_line_range_totals()
+    
+    if resolved is None:
+        resolved = resolve_picks(member, all_weeks_data)
+    
+    for pick in resolved:
+        add_line_range_pick(line_ranges, pick, bet_amount)
     
     return line_ranges
 
 
-def calculate_streak_stats(member, all_weeks_data, bet_amount=100):
+def new_streak_state():
+    """Create the running state of calculate_streak_stats."""
+    return {
+        'current_streak': 0,
+        'current_streak_type': None,
+        'longest_win_streak': 0,
+        'longest_lose_streak': 0
+    }
+
+
+def add_streak_pick(streaks, pick):
+    """Extend the running streaks by the next resolved pick, in pick order."""
+    if pick['unit_profit'] > 0:
+        if streaks['current_streak_type'] == 'win':
+            streaks['current_streak'] += 1
+        else:
+            streaks['current_streak'] = 1
+            streaks['current_streak_type'] = 'win'
+        streaks['longest_win_streak'] = max(streaks['longest_win_streak'], streaks['current_streak'])
+    else:
+        if streaks['current_streak_type'] == 'loss':
+            streaks['current_streak'] += 1
+        else:
+            streaks['current_streak'] = 1
+            streaks['current_streak_type'] = 'loss'
+        streaks['longest_lose_streak'] = max(streaks['longest_lose_streak'], streaks['current_streak'])
+
+
+def format_streaks(streaks):
+    """Format the running streak state for the 'streaks' export section."""
+    return {
+        'current_streak': streaks['current_streak'] if streaks['current_streak_type'] else 0,
+        'current_streak_type': streaks['current_streak_type'] if streaks['current_streak_type'] else 'none',
+        'longest_win_streak': streaks['longest_win_streak'],
+        'longest_lose_streak': streaks['longest_lose_streak']
+    }
+
+
+def calculate_streak_stats(member, all_weeks_data, bet_amount=100, resolved=None):
     """Calculate winning/losing streaks."""
-    all_picks = member["entries"][0]["picks"]
-    
-    picks_with_results = []
-    for pick in all_picks:
-        profit = calculate_profit(pick, all_weeks_data, bet_amount)
-        if profit is not None:
-            picks_with_results.append({
-                'profit': profit,
-                'won': profit > 0
-            })
+    if resolved is None:
+        resolved = resolve_picks(member, all_weeks_data)
     
-    current_streak = 0
-    current_streak_type = None
-    longest_win_streak = 0
-    longest_lose_streak = 0
+    streaks = new_streak_state()
+    for pick in resolved:
+        add_streak_pick(streaks, pick)
     
-    for pick in picks_with_results:
-        if pick['won']:
-            if current_streak_type == 'win':
-                current_streak += 1
-            else:
-                current_streak = 1
-                current_streak_type = 'win'
-            longest_win_streak = max(longest_win_streak, current_streak)
-        else:
-            if current_streak_type == 'loss':
-                current_streak += 1
-            else:
-                current_streak = 1
-                current_streak_type = 'loss'
-            longest_lose_streak = max(longest_lose_streak, current_streak)
+    return format_streaks(streaks)
+
+
+def add_weekly_pick(weekly_data, pick, bet_amount=100):
+    """Add one resolved pick to the sums of its week in `weekly_data`."""
+    profit = pick['unit_profit'] * bet_amount
+    week = pick['week']
     
-    return {
-        'current_streak': current_streak if current_streak_type else 0,
-        'current_streak_type': current_streak_type if current_streak_type else 'none',
-        'longest_win_streak': longest_win_streak,
-        'longest_lose_streak': longest_lose_streak
-    }
+    if week not in weekly_data:
+        weekly_data[week] = {
+            'week': week,
+            'wins': 0,
+            'losses': 0,
+            'profit': 0
+        }
+    
+    weekly_data[week]['profit'] += profit
+    if profit > 0:
+        weekly_data[week]['wins'] += 1
+    else:
+        weekly_data[week]['losses'] += 1
+
 
+def format_weekly(weekly_data):
+    """Return the per-week sums as the 'weekly' export section, in week order."""
+    return sorted(weekly_data.values(), key=lambda x: x['week'])
 
-def calculate_weekly_stats(member, all_weeks_data, bet_amount=100):
+
+def calculate_weekly_stats(member, all_weeks_data, bet_amount=100, resolved=None):
     """Calculate weekly performance details."""
-    all_picks = member["entries"][0]["picks"]
+    if resolved is None:
+        resolved = resolve_picks(member, all_weeks_data)
+    
     weekly_data = {}
     
-    for pick in all_picks:
-        profit = calculate_profit(pick, all_weeks_data, bet_amount)
-        if profit is None:
+    for pick in resolved:
+        add_weekly_pick(weekly_data, pick, bet_amount)
+    
+    return format_weekly(weekly_data)
+
+
+# Historical ROI by line category used by the confidence-based strategy
+CONFIDENCE_CATEGORY_ROI = {
+    'heavy_favorites': -5.0,  # From your data
+    'favorites': 12.3,
+    'slight_underdogs': 18.9,
+    'big_underdogs': 0
+}
+
+# Tunable strategy parameters; walk_forward_backtest fits or searches these per fold
+DEFAULT_STRATEGY_PARAMS = {
+    'fixed_fraction': 0.05,
+    'conservative_fraction': 0.01,
+    'kelly_multiplier': 0.5,
+    'kelly_cap': 0.25,
+    'category_roi': CONFIDENCE_CATEGORY_ROI
+}
+
+
+# Total history points from which calculate_risk_metrics_batch uses a process pool
+RISK_POOL_MIN_POINTS = 200000
+
+# Strategies whose bet is a fraction of the current or starting bankroll, so
+# their whole bankroll path scales linearly with the starting bankroll
+PROPORTIONAL_STRATEGIES = ('fixed_percentage', 'conservative_percentage', 'kelly_criterion',
+                           'unit_based', 'confidence_based')
+
+# Strategies sized with the win rate over every settled pick, so each new
+# pick changes their whole bankroll path
+HINDSIGHT_STRATEGIES = ('kelly_criterion',)
+
+
+def categorize_line(line):
+    """Return the bankroll-simulation line category for an American line."""
+    if line <= -200:
+        return 'heavy_favorites'
+    elif -199 <= line <= -110:
+        return 'favorites'
+    elif 110 <= line <= 199:
+        return 'slight_underdogs'
+    else:
+        return 'big_underdogs'
+
+
+def strategy_names(bet_amount=100, params=None):
+    """Display names of the bankroll strategies for a stake and parameter set."""
+    if params is None:
+        params = DEFAULT_STRATEGY_PARAMS
+    
+    return {
+        'flat_betting': f'Flat Betting (${bet_amount:g})',
+        'fixed_percentage': f"Fixed {params['fixed_fraction'] * 100:g}% of Bankroll",
+        'conservative_percentage': f"Conservative {params['conservative_fraction'] * 100:g}% of Bankroll",
+        'kelly_criterion': 'Kelly Criterion',
+        'martingale': 'Martingale (Double on Loss)',
+        'anti_martingale': 'Anti-Martingale (Double on Win)',
+        'unit_based': 'Unit-Based on Line',
+        'confidence_based': 'Confidence-Based (ROI Weighted)'
+    }
+
+
+def init_strategy_states(starting_bankroll=1000, bet_amount=100, keys=None, params=None):
+    """Create the initial state of every bankroll strategy (or only `keys`)."""
+    strategies = {}
+    for strategy_name, display_name in strategy_names(bet_amount, params).items():
+        if keys is not None and strategy_name not in keys:
             continue
-        
-        # Find the proposition to get the week
-        prop_id = pick['propositionId']
-        week = None
-        
-        for week_num, week_data in all_weeks_data.items():
-            for prop in week_data["propositions"]:
-                if prop["id"] == prop_id:
-                    week = week_num
-                    break
-            if week:
-                break
-        
-        if week is None:
+        strategies[strategy_name] = {
+            'name': display_name,
+            'bankroll': starting_bankroll,
+            'history': [starting_bankroll]
+        }
+    
+    for strategy_name in ('martingale', 'anti_martingale'):
+        if strategy_name not in strategies:
             continue
-        
-        if week not in weekly_data:
-            weekly_data[week] = {
-                'week': week,
-                'wins': 0,
-                'losses': 0,
-                'profit': 0
-            }
-        
-        weekly_data[week]['profit'] += profit
-        if profit > 0:
-            weekly_data[week]['wins'] += 1
-        else:
-            weekly_data[week]['losses'] += 1
+        strategies[strategy_name]['current_bet'] = bet_amount
+        strategies[strategy_name]['base_bet'] = bet_amount
+    
+    return strategies
+
+
+def pick_context(line, won, win_rate, params=None):
+    """
+    Compute the per-pick inputs every strategy shares: odds, Kelly fraction,
+    unit size and confidence multiplier. These depend only on the pick, so a
+    batch computes them once and reuses them for every starting bankroll.
+    """
+    if params is None:
+        params = DEFAULT_STRATEGY_PARAMS
     
-    weekly_list = sorted(weekly_data.values(), key=lambda x: x['week'])
+    # Calculate decimal odds
+    decimal_odds = 1 + line_payout(line)
+    line_category = categorize_line(line)
     
-    return weekly_list
+    # Kelly formula: f = (bp - q) / b
+    b = decimal_odds - 1
+    p = win_rate
+    q = 1 - p
+    kelly_fraction = (b * p - q) / b if b > 0 else 0
+    
+    # Scale by kelly_multiplier (half-Kelly by default) and clamp to [0, kelly_cap]
+    kelly_fraction = kelly_fraction * params['kelly_multiplier']
+    kelly_fraction = max(0, min(kelly_fraction, params['kelly_cap']))
+    
+    # Adjust units based on line category
+    if line_category == 'heavy_favorites':
+        units = 0.5  # Bet less on heavy favorites (you lose here)
+    elif line_category == 'favorites':
+        units = 1.0  # Standard bet (your best category)
+    elif line_category == 'slight_underdogs':
+        units = 1.5  # Bet more on slight underdogs (high ROI)
+    else:
+        units = 0.5  # Minimal on big underdogs
+    
+    # Scale confidence bet size based on the category ROI
+    category_roi = params['category_roi'][line_category]
+    if category_roi > 15:
+        multiplier = 2.0  # Double on high confidence
+    elif category_roi > 5:
+        multiplier = 1.5
+    elif category_roi > 0:
+        multiplier = 1.0
+    elif category_roi > -5:
+        multiplier = 0.5
+    else:
+        multiplier = 0.25  # Minimal bet on losing categories
+    
+    return {
+        'won': won,
+        'decimal_odds': decimal_odds,
+        'kelly_fraction': kelly_fraction,
+        'units': units,
+        'multiplier': multiplier,
+        'fixed_fraction': params['fixed_fraction'],
+        'conservative_fraction': params['conservative_fraction']
+    }
 
 
-def simulate_bankroll_strategies(member, all_weeks_data, starting_bankroll=1000):
-    """Simulate different bankroll management strategies."""
-    all_picks = member["entries"][0]["picks"]
+def apply_pick(strategies, context, starting_bankroll=1000, bet_amount=100):
+    """Advance every strategy in `strategies` by one pick from `pick_context`."""
+    won = context['won']
+    decimal_odds = context['decimal_odds']
     
-    # Get all picks with their data (only CORRECT/INCORRECT, not UNDECIDED)
-    picks_data = []
-    for pick in all_picks:
-        your_outcome_id = pick['outcomesPicked'][0]['outcomeId']
-        your_result = pick['outcomesPicked'][0]['result']
+    for strategy_name, strategy in strategies.items():
+        bankroll = strategy['bankroll']
         
-        # Skip undecided picks
-        if your_result == "UNDECIDED":
+        # Skip if bankroll is depleted
+        if bankroll <= 0:
+            strategy['history'].append(0)
             continue
         
-        prop_id = pick['propositionId']
+        # Determine bet size based on strategy
+        if strategy_name == 'flat_betting':
+            bet_size = min(bet_amount, bankroll)
+            
+        elif strategy_name == 'fixed_percentage':
+            bet_size = bankroll * context['fixed_fraction']
+            
+        elif strategy_name == 'conservative_percentage':
+            bet_size = bankroll * context['conservative_fraction']
+            
+        elif strategy_name == 'kelly_criterion':
+            bet_size = bankroll * context['kelly_fraction']
+            
+        elif strategy_name == 'martingale':
+            # Double bet after loss, reset after win
+            bet_size = min(strategy['current_bet'], bankroll)
+            
+        elif strategy_name == 'anti_martingale':
+            # Double bet after win, reset after loss
+            bet_size = min(strategy['current_bet'], bankroll)
+            
+        elif strategy_name == 'unit_based':
+            # Base unit = 1% of starting bankroll
+            base_unit = starting_bankroll * 0.01
+            bet_size = min(base_unit * context['units'], bankroll)
+            
+        elif strategy_name == 'confidence_based':
+            # Base bet = 2% of bankroll
+            base_bet = bankroll * 0.02
+            bet_size = min(base_bet * context['multiplier'], bankroll)
         
-        # Find the proposition
-        matching_prop = None
-        for week_data in all_weeks_data.values():
-            for prop in week_data["propositions"]:
-                if prop["id"] == prop_id:
-                    matching_prop = prop
-                    break
-            if matching_prop:
-                break
+        # Ensure bet size is reasonable
+        bet_size = min(bet_size, bankroll)
+        bet_size = max(bet_size, 0)
         
-        if not matching_prop:
-            continue
+        # Calculate profit/loss
+        if won:
+            profit = bet_size * (decimal_odds - 1)
+        else:
+            profit = -bet_size
         
-        # Find the outcome picked
-        your_team = None
-        for outcome in matching_prop["possibleOutcomes"]:
-            if outcome["id"] == your_outcome_id:
-                your_team = outcome
-                break
+        # Update bankroll
+        strategy['bankroll'] += profit
+        strategy['history'].append(strategy['bankroll'])
         
-        if not your_team:
-            continue
+        # Update martingale bet sizes
+        if strategy_name == 'martingale':
+            if won:
+                strategy['current_bet'] = strategy['base_bet']  # Reset on win
+            else:
+                strategy['current_bet'] = min(strategy['current_bet'] * 2, bankroll)  # Double on loss
+                
+        elif strategy_name == 'anti_martingale':
+            if won:
+                strategy['current_bet'] = min(strategy['current_bet'] * 2, bankroll * 0.25)  # Double on win, max 25%
+            else:
+                strategy['current_bet'] = strategy['base_bet']  # Reset on loss
+
+
+def step_strategies(strategies, line, won, win_rate, starting_bankroll=1000, bet_amount=100, params=None):
+    """Advance every strategy in `strategies` by one settled pick."""
+    apply_pick(strategies, pick_context(line, won, win_rate, params), starting_bankroll, bet_amount)
+
+
+def new_risk_state():
+    """Create the empty running sums that calculate_risk_metrics folds a history into."""
+    return {
+        'points': 0,
+        'previous': None,
+        'peak': None,
+        'lowest': None,
+        'max_drawdown': 0,
+        'max_drawdown_pct': 0,
+        'trough': 0,
+        'trough_peak': None,
+        'recovered': None,
+        'underwater': 0,
+        'underwater_run': 0,
+        'max_underwater_run': 0,
+        'drawdown_pct_squares': 0,
+        'returns': 0,
+        'mean_return': 0,
+        'return_m2': 0,
+        'downside_squares': 0
+    }
+
+
+def extend_risk_state(risk, values):
+    """
+    Fold the next bankroll values of a history into its running risk sums.
+
+    The sums are plain numbers, so a history can be folded in pieces (the
+    incremental export checkpoints them between runs). Returns are
+    accumulated with Welford's running mean and variance.
+    """
+    index = risk['points']
+    previous, peak, lowest = risk['previous'], risk['peak'], risk['lowest']
+    max_drawdown, max_drawdown_pct = risk['max_drawdown'], risk['max_drawdown_pct']
+    trough, trough_peak, recovered = risk['trough'], risk['trough_peak'], risk['recovered']
+    underwater, underwater_run, max_underwater_run = risk['underwater'], risk['underwater_run'], risk['max_underwater_run']
+    drawdown_pct_squares = risk['drawdown_pct_squares']
+    returns, mean_return, return_m2, downside_squares = (
+        risk['returns'], risk['mean_return'], risk['return_m2'], risk['downside_squares'])
+    
+    for value in values:
+        peak = value if peak is None else max(peak, value)
+        lowest = value if lowest is None else min(lowest, value)
+        drawdown = peak - value
+        drawdown_pct = drawdown / peak * 100 if peak > 0 else 0
+        max_drawdown_pct = max(max_drawdown_pct, drawdown_pct)
+        drawdown_pct_squares += drawdown_pct ** 2
         
-        # Extract betting line
-        betting_line = None
-        for mapping in your_team["mappings"]:
-            if mapping["type"] == "BETTING_LINE":
-                betting_line = mapping["value"]
-                break
+        # The deepest drawdown is the first one reaching the maximum; it has
+        # recovered once the bankroll is back at the peak it fell from
+        if drawdown > max_drawdown:
+            max_drawdown, trough, trough_peak, recovered = drawdown, index, peak, None
+        elif recovered is None and trough_peak is not None and value >= trough_peak:
+            recovered = index
         
-        if not betting_line:
-            continue
+        # Length of the current underwater stretch, reset at every new peak
+        if drawdown > 0:
+            underwater += 1
+            underwater_run += 1
+            max_underwater_run = max(max_underwater_run, underwater_run)
+        else:
+            underwater_run = 0
         
-        line = int(betting_line)
-        won = your_result == "CORRECT"
+        if previous is not None and previous > 0:
+            change = value / previous - 1
+            returns += 1
+            delta = change - mean_return
+            mean_return += delta / returns
+            return_m2 += delta * (change - mean_return)
+            downside_squares += min(change, 0) ** 2
         
-        picks_data.append({
-            'line': line,
-            'won': won
-        })
+        previous = value
+        index += 1
     
-    if len(picks_data) == 0:
-        print("Warning: No completed picks data found for bankroll simulation!")
-        return []
+    risk.update({
+        'points': index, 'previous': previous, 'peak': peak, 'lowest': lowest,
+        'max_drawdown': max_drawdown, 'max_drawdown_pct': max_drawdown_pct,
+        'trough': trough, 'trough_peak': trough_peak, 'recovered': recovered,
+        'underwater': underwater, 'underwater_run': underwater_run, 'max_underwater_run': max_underwater_run,
+        'drawdown_pct_squares': drawdown_pct_squares, 'returns': returns, 'mean_return': mean_return,
+        'return_m2': return_m2, 'downside_squares': downside_squares
+    })
+    return risk
+
+
+def risk_metrics_from_state(risk):
+    """Turn the running risk sums of a history into its risk metrics."""
+    returns = risk['returns']
+    if returns:
+        mean_return = risk['mean_return']
+        volatility = (risk['return_m2'] / returns) ** 0.5
+        downside = (risk['downside_squares'] / returns) ** 0.5
+    else:
+        mean_return = volatility = downside = 0
     
-    print(f"Simulating bankroll strategies for {len(picks_data)} completed picks...")
+    if risk['max_drawdown'] == 0:
+        recovery_time = 0
+    else:
+        recovery_time = risk['recovered'] - risk['trough'] if risk['recovered'] is not None else None
     
-    # Calculate historical performance by line category for confidence-based strategy
-    line_performance = {
-        'heavy_favorites': {'wins': 0, 'total': 0, 'roi': -5.0},  # From your data
-        'favorites': {'wins': 0, 'total': 0, 'roi': 12.3},
-        'slight_underdogs': {'wins': 0, 'total': 0, 'roi': 18.9},
-        'big_underdogs': {'wins': 0, 'total': 0, 'roi': 0}
+    steps = risk['points'] - 1
+    return {
+        'peak': risk['peak'],
+        'lowest': risk['lowest'],
+        'max_drawdown': risk['max_drawdown'],
+        'max_drawdown_pct': risk['max_drawdown_pct'],
+        'max_drawdown_duration': risk['max_underwater_run'],
+        'recovery_time': recovery_time,
+        'volatility': volatility * 100,
+        'sharpe_ratio': mean_return / volatility if volatility else 0,
+        'sortino_ratio': mean_return / downside if downside else 0,
+        'time_under_water': risk['underwater'] / steps * 100 if steps else 0,
+        'ulcer_index': (risk['drawdown_pct_squares'] / risk['points']) ** 0.5
     }
+
+
+def calculate_risk_metrics(history):
+    """
+    Calculate drawdown and return-based risk metrics for a bankroll history.
+
+    The history is folded through extend_risk_state in one pass, so the
+    simulation loop only has to record the history. Durations are measured
+    in picks.
+    """
+    return risk_metrics_from_state(extend_risk_state(new_risk_state(), history))
+
+
+def calculate_risk_metrics_batch(histories, workers=None):
+    """
+    Calculate risk metrics for many bankroll histories, in input order.
+
+    Histories are independent, so once a batch holds at least
+    RISK_POOL_MIN_POINTS values it is spread over a process pool, like the
+    backtest folds. Smaller batches run in-process, where starting the pool
+    would cost more than it saves.
+    """
+    histories = list(histories)
+    if workers == 1 or sum(len(h) for h in histories) < RISK_POOL_MIN_POINTS:
+        return [calculate_risk_metrics(history) for history in histories]
     
-    for pick in picks_data:
-        line = pick['line']
-        won = pick['won']
-        
-        if line <= -200:
-            category = 'heavy_favorites'
-        elif -199 <= line <= -110:
-            category = 'favorites'
-        elif 110 <= line <= 199:
-            category = 'slight_underdogs'
-        else:
-            category = 'big_underdogs'
-        
-        line_performance[category]['total'] += 1
-        if won:
-            line_performance[category]['wins'] += 1
-    
-    # Initialize strategies
-    strategies = {
-        'flat_betting': {
-            'name': 'Flat Betting ($100)',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0
-        },
-        'fixed_percentage': {
-            'name': 'Fixed 5% of Bankroll',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0
-        },
-        'conservative_percentage': {
-            'name': 'Conservative 1% of Bankroll',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0
-        },
-        'kelly_criterion': {
-            'name': 'Kelly Criterion',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0
-        },
-        'martingale': {
-            'name': 'Martingale (Double on Loss)',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0,
-            'current_bet': 100,
-            'base_bet': 100
-        },
-        'anti_martingale': {
-            'name': 'Anti-Martingale (Double on Win)',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0,
-            'current_bet': 100,
-            'base_bet': 100
-        },
-        'unit_based': {
-            'name': 'Unit-Based on Line',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0
-        },
-        'confidence_based': {
-            'name': 'Confidence-Based (ROI Weighted)',
-            'bankroll': starting_bankroll,
-            'history': [starting_bankroll],
-            'peak': starting_bankroll,
-            'lowest': starting_bankroll,
-            'max_drawdown': 0
-        }
-    }
-    
-    # Calculate win rate for Kelly
-    total_wins = sum(1 for p in picks_data if p['won'])
-    win_rate = total_wins / len(picks_data)
-    
-    # Simulate each strategy
-    for pick in picks_data:
-        line = pick['line']
-        won = pick['won']
-        
-        # Calculate decimal odds
-        if line < 0:
-            decimal_odds = 1 + (100 / abs(line))
-        else:
-            decimal_odds = 1 + (line / 100)
-        
-        # Determine line category
-        if line <= -200:
-            line_category = 'heavy_favorites'
-        elif -199 <= line <= -110:
-            line_category = 'favorites'
-        elif 110 <= line <= 199:
-            line_category = 'slight_underdogs'
-        else:
-            line_category = 'big_underdogs'
-        
-        for strategy_name, strategy in strategies.items():
-            bankroll = strategy['bankroll']
-            
-            # Skip if bankroll is depleted
-            if bankroll <= 0:
-                strategy['history'].append(0)
-                continue
-            
-            # Determine bet size based on strategy
-            if strategy_name == 'flat_betting':
-                bet_size = min(100, bankroll)
-                
-            elif strategy_name == 'fixed_percentage':
-                bet_size = bankroll * 0.05  # 5%
-                
-            elif strategy_name == 'conservative_percentage':
-                bet_size = bankroll * 0.01  # 1%
-                
-            elif strategy_name == 'kelly_criterion':
-                # Kelly formula: f = (bp - q) / b
-                b = decimal_odds - 1
-                p = win_rate
-                q = 1 - p
-                kelly_fraction = (b * p - q) / b if b > 0 else 0
-                
-                # Use half-Kelly for safety
-                kelly_fraction = kelly_fraction * 0.5
-                
-                # Clamp between 0 and 0.25 (max 25% of bankroll)
-                kelly_fraction = max(0, min(kelly_fraction, 0.25))
-                
-                bet_size = bankroll * kelly_fraction
-                
-            elif strategy_name == 'martingale':
-                # Double bet after loss, reset after win
-                bet_size = min(strategy['current_bet'], bankroll)
-                
-            elif strategy_name == 'anti_martingale':
-                # Double bet after win, reset after loss
-                bet_size = min(strategy['current_bet'], bankroll)
-                
-            elif strategy_name == 'unit_based':
-                # Base unit = 1% of starting bankroll ($10)
-                base_unit = starting_bankroll * 0.01
-                
-                # Adjust units based on line category
-                if line_category == 'heavy_favorites':
-                    units = 0.5  # Bet less on heavy favorites (you lose here)
-                elif line_category == 'favorites':
-                    units = 1.0  # Standard bet (your best category)
-                elif line_category == 'slight_underdogs':
-                    units = 1.5  # Bet more on slight underdogs (high ROI)
-                else:
-                    units = 0.5  # Minimal on big underdogs
-                
-                bet_size = min(base_unit * units, bankroll)
-                
-            elif strategy_name == 'confidence_based':
-                # Base bet = 2% of bankroll
-                base_bet = bankroll * 0.02
-                
-                # Get ROI for this category
-                category_roi = line_performance[line_category]['roi']
-                
-                # Scale bet size based on ROI
-                if category_roi > 15:
-                    multiplier = 2.0  # Double on high confidence
-                elif category_roi > 5:
-                    multiplier = 1.5
-                elif category_roi > 0:
-                    multiplier = 1.0
-                elif category_roi > -5:
-                    multiplier = 0.5
-                else:
-                    multiplier = 0.25  # Minimal bet on losing categories
-                
-                bet_size = min(base_bet * multiplier, bankroll)
-            
-            # Ensure bet size is reasonable
-            bet_size = min(bet_size, bankroll)
-            bet_size = max(bet_size, 0)
-            
-            # Calculate profit/loss
-            if won:
-                profit = bet_size * (decimal_odds - 1)
-            else:
-                profit = -bet_size
-            
-            # Update bankroll
-            strategy['bankroll'] += profit
-            strategy['history'].append(strategy['bankroll'])
-            
-            # Update martingale bet sizes
-            if strategy_name == 'martingale':
-                if won:
-                    strategy['current_bet'] = strategy['base_bet']  # Reset on win
-                else:
-                    strategy['current_bet'] = min(strategy['current_bet'] * 2, bankroll)  # Double on loss
-                    
-            elif strategy_name == 'anti_martingale':
-                if won:
-                    strategy['current_bet'] = min(strategy['current_bet'] * 2, bankroll * 0.25)  # Double on win, max 25%
-                else:
-                    strategy['current_bet'] = strategy['base_bet']  # Reset on loss
-            
-            # Update peak, lowest, and max drawdown
-            strategy['peak'] = max(strategy['peak'], strategy['bankroll'])
-            strategy['lowest'] = min(strategy['lowest'], strategy['bankroll'])
-            drawdown = strategy['peak'] - strategy['bankroll']
-            strategy['max_drawdown'] = max(strategy['max_drawdown'], drawdown)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(histories) // 64)
+        return list(executor.map(calculate_risk_metrics, histories, chunksize=chunksize))
+
+
+def format_strategies(strategies, starting_bankroll=1000, risk_metrics=True, risk=None):
+    """
+    Format simulated strategy states for export.
+
+    `risk` is an optional list of precomputed calculate_risk_metrics results
+    in strategy order. With risk_metrics=False only the peak, lowest point
+    and max drawdown are computed and the risk_metrics section is left out,
+    for callers such as the backtest grid search that discard it.
+    """
+    if risk_metrics and risk is None:
+        risk = calculate_risk_metrics_batch(strategy['history'] for strategy in strategies.values())
     
-    # Format output
     strategies_output = []
-    for strategy_name, strategy in strategies.items():
+    for i, (strategy_name, strategy) in enumerate(strategies.items()):
+        history = strategy['history']
         ending_bankroll = strategy['bankroll']
         profit = ending_bankroll - starting_bankroll
-        roi = (profit / starting_bankroll) * 100
+        roi = (profit / starting_bankroll) * 100 if starting_bankroll > 0 else 0
         
-        strategies_output.append({
+        if risk_metrics:
+            metrics = risk[i]
+            peak, lowest, max_drawdown = metrics['peak'], metrics['lowest'], metrics['max_drawdown']
+        else:
+            peak, lowest = max(history), min(history)
+            max_drawdown = max(p - value for p, value in zip(itertools.accumulate(history, max), history))
+        
+        output = {
             'name': strategy['name'],
             'strategy_key': strategy_name,
             'starting_bankroll': starting_bankroll,
             'ending_bankroll': round(ending_bankroll, 2),
             'profit': round(profit, 2),
             'roi': round(roi, 1),
-            'peak_bankroll': round(strategy['peak'], 2),
-            'lowest_point': round(strategy['lowest'], 2),
-            'max_drawdown': round(strategy['max_drawdown'], 2),
-            'history': [round(h, 2) for h in strategy['history']]
-        })
+            'peak_bankroll': round(peak, 2),
+            'lowest_point': round(lowest, 2),
+            'max_drawdown': round(max_drawdown, 2)
+        }
+        if risk_metrics:
+            output['risk_metrics'] = {
+                'max_drawdown_pct': round(metrics['max_drawdown_pct'], 1),
+                'max_drawdown_duration': metrics['max_drawdown_duration'],
+                'recovery_time': metrics['recovery_time'],
+                'volatility': round(metrics['volatility'], 2),
+                'sharpe_ratio': round(metrics['sharpe_ratio'], 3),
+                'sortino_ratio': round(metrics['sortino_ratio'], 3),
+                'time_under_water': round(metrics['time_under_water'], 1),
+                'ulcer_index': round(metrics['ulcer_index'], 2)
+            }
+        output['history'] = [round(h, 2) for h in history]
+        strategies_output.append(output)
     
     return strategies_output
 
 
-def export_stats_to_json(stats, member, all_weeks_data, bet_amount=100):
-    """Export comprehensive stats to JSON file."""
+def simulate_bankroll_batch(picks_data, starting_bankrolls, bet_amount=100):
+    """
+    Simulate every strategy for several starting bankrolls in one pass.
+
+    `picks_data` is a list of settled picks with 'line' and 'won' keys.
+    Returns one formatted strategy list per starting bankroll, in order.
+
+    The per-pick odds, Kelly fraction and multipliers are computed once.
+    Strategies in PROPORTIONAL_STRATEGIES are simulated only for the first
+    positive bankroll and scaled to the other positive ones; only the
+    strategies that bet an absolute amount (flat, martingale,
+    anti-martingale) are re-simulated. A bankroll of zero or less is
+    simulated in full, since nothing scales to it.
+    """
+    if not picks_data or not starting_bankrolls:
+        return [[] for _ in starting_bankrolls]
+    
+    # Calculate win rate for Kelly
+    total_wins = sum(1 for p in picks_data if p['won'])
+    win_rate = total_wins / len(picks_data)
+    
+    contexts = [pick_context(pick['line'], pick['won'], win_rate) for pick in picks_data]
+    
+    # Scale from the first positive bankroll; nothing scales to or from an empty one
+    reference_bankroll = next((bankroll for bankroll in starting_bankrolls if bankroll > 0), None)
+    absolute_keys = [key for key in init_strategy_states() if key not in PROPORTIONAL_STRATEGIES]
+    runs = []
+    for bankroll in starting_bankrolls:
+        scaled_run = bankroll > 0 and bankroll != reference_bankroll
+        keys = absolute_keys if scaled_run else None
+        runs.append((bankroll, scaled_run, init_strategy_states(bankroll, bet_amount, keys)))
+    
+    for context in contexts:
+        for starting_bankroll, _, strategies in runs:
+            apply_pick(strategies, context, starting_bankroll, bet_amount)
+    
+    reference = next((strategies for bankroll, _, strategies in runs if bankroll == reference_bankroll), None)
+    all_strategies = []
+    for starting_bankroll, scaled_run, strategies in runs:
+        if not scaled_run:
+            all_strategies.append((starting_bankroll, strategies))
+            continue
+        scale = starting_bankroll / reference_bankroll
+        scaled = {}
+        for key, strategy in reference.items():
+            if key in PROPORTIONAL_STRATEGIES:
+                scaled[key] = {
+                    'name': strategy['name'],
+                    'bankroll': strategy['bankroll'] * scale,
+                    'history': [h * scale for h in strategy['history']]
+                }
+            else:
+                scaled[key] = strategies[key]
+        all_strategies.append((starting_bankroll, scaled))
+    
+    # One risk batch across every bankroll, then split it back per run
+    risk = calculate_risk_metrics_batch(
+        strategy['history'] for _, strategies in all_strategies for strategy in strategies.values()
+    )
+    results = []
+    for starting_bankroll, strategies in all_strategies:
+        results.append(format_strategies(strategies, starting_bankroll, risk=risk[:len(strategies)]))
+        risk = risk[len(strategies):]
+    
+    return results
+
+
+def iter_bankroll_strategies(picks_data, starting_bankroll=1000, bet_amount=100):
+    """
+    Simulate and format the strategies one at a time, yielding each in turn.
+
+    The per-pick contexts are shared, but only one strategy's history is
+    alive at a time, so a streaming writer never holds every history.
+    """
+    total_wins = sum(1 for p in picks_data if p['won'])
+    win_rate = total_wins / len(picks_data)
+    contexts = [pick_context(pick['line'], pick['won'], win_rate) for pick in picks_data]
     
-    line_range_stats = calculate_line_range_stats(member, all_weeks_data, bet_amount)
-    streak_stats = calculate_streak_stats(member, all_weeks_data, bet_amount)
-    weekly_stats = calculate_weekly_stats(member, all_weeks_data, bet_amount)
-    bankroll_strategies = simulate_bankroll_strategies(member, all_weeks_data)
+    for key in strategy_names(bet_amount):
+        strategies = init_strategy_states(starting_bankroll, bet_amount, [key])
+        for context in contexts:
+            apply_pick(strategies, context, starting_bankroll, bet_amount)
+        yield format_strategies(strategies, starting_bankroll)[0]
+
+
+def simulate_bankroll_strategies(member, all_weeks_data, starting_bankroll=1000, bet_amount=100, resolved=None,
+                                 stream=False):
+    """
+    Simulate different bankroll management strategies.
+
+    With stream=True the formatted strategies are returned as a generator
+    (see iter_bankroll_strategies) instead of a list.
+    """
+    if resolved is None:
+        resolved = resolve_picks(member, all_weeks_data)
     
-    all_picks = member["entries"][0]["picks"]
-    all_profits = []
-    for pick in all_picks:
-        profit = calculate_profit(pick, all_weeks_data, bet_amount)
-        if profit is not None:
-            all_profits.append(profit)
+    # Only CORRECT/INCORRECT picks, not UNDECIDED
+    picks_data = [p for p in resolved if p['result'] != "UNDECIDED"]
     
-    wins_only = [p for p in all_profits if p > 0]
-    losses_only = [p for p in all_profits if p < 0]
+    if len(picks_data) == 0:
+        print("Warning: No completed picks data found for bankroll simulation!")
+        return []
     
-    # Format line range stats
+    print(f"Simulating bankroll strategies for {len(picks_data)} completed picks...")
+    
+    if stream:
+        return iter_bankroll_strategies(picks_data, starting_bankroll, bet_amount)
+    return simulate_bankroll_batch(picks_data, [starting_bankroll], bet_amount)[0]
+
+
+def build_what_if(member, all_weeks_data, entry_index=0):
+    """
+    Precompute unit-stake results for fast what-if questions.
+
+    Flat-stake profit is linear in bet_amount, so the returned table only
+    needs to be built once; what_if_flat_stats and what_if_bankrolls then
+    answer for any bet size or starting bankroll without re-resolving picks.
+    """
+    resolved = resolve_picks(member, all_weeks_data, entry_index)
+    return {
+        'resolved': resolved,
+        'completed': [p for p in resolved if p['result'] != "UNDECIDED"],
+        'unit_stats': summarize_flat_stats(resolved, bet_amount=1)
+    }
+
+
+def what_if_flat_stats(what_if, bet_amount):
+    """Scale the precomputed unit-stake stats to `bet_amount`."""
+    money_fields = ('total_winnings', 'total_losses', 'net_profit',
+                    'avg_win', 'avg_loss', 'biggest_win', 'biggest_loss')
+    stats = dict(what_if['unit_stats'])
+    for field in money_fields:
+        stats[field] = stats[field] * bet_amount
+    return stats
+
+
+def what_if_bankrolls(what_if, starting_bankrolls, bet_amount=100):
+    """Simulate every strategy for each starting bankroll in a single batched pass."""
+    results = simulate_bankroll_batch(what_if['completed'], starting_bankrolls, bet_amount)
+    return dict(zip(starting_bankrolls, results))
+
+
+def print_what_if(what_if, bet_amounts, starting_bankrolls):
+    """Print flat-stake and bankroll what-if tables."""
+    print("\n" + "=" * 70)
+    print("WHAT-IF: FLAT STAKES")
+    print("=" * 70)
+    for bet_amount in bet_amounts:
+        stats = what_if_flat_stats(what_if, bet_amount)
+        print(f"${bet_amount:>8g} per pick | Net: ${stats['net_profit']:>10.2f} | ROI: {stats['roi']:.1f}%")
+    
+    print("\n" + "=" * 70)
+    print("WHAT-IF: STARTING BANKROLLS")
+    print("=" * 70)
+    bet_amount = bet_amounts[0]
+    for bankroll, strategies in what_if_bankrolls(what_if, starting_bankrolls, bet_amount).items():
+        print(f"\nStarting bankroll ${bankroll:g} (base bet ${bet_amount:g}):")
+        for strategy in sorted(strategies, key=lambda s: s['roi'], reverse=True):
+            print(f"  {strategy['name']:<34} ${strategy['ending_bankroll']:>12.2f}  ROI {strategy['roi']:>7.1f}%")
+    print("=" * 70)
+
+
+# Parameters searched on each training window (fitted parameters are added per fold)
+BACKTEST_GRID = {
+    'fixed_fraction': [0.01, 0.02, 0.05, 0.10],
+    'kelly_multiplier': [0.25, 0.5, 1.0]
+}
+
+# The strategy each BACKTEST_GRID parameter affects
+BACKTEST_PARAM_STRATEGIES = {
+    'fixed_fraction': 'fixed_percentage',
+    'kelly_multiplier': 'kelly_criterion'
+}
+
+# Resolved pick streams shared with backtest worker processes
+_BACKTEST_STREAMS = None
+
+
+def load_backtest_streams(season_dirs):
+    """
+    Resolve every entry of every season once for walk-forward backtesting.
+
+    Each season directory holds the member_data.json / all_weeks_data.json
+    cache of one season. Picks of the same entry index are chained across
+    seasons in the order given, split into (season, week) segments.
+    """
+    streams = {}
+    
+    for season_dir in season_dirs:
+        with open(os.path.join(season_dir, MEMBER_FILE)) as f:
+            member = json.load(f)
+        with open(os.path.join(season_dir, WEEKS_FILE)) as f:
+            all_weeks = json.load(f)
+        
+        season = os.path.basename(os.path.normpath(season_dir)) or season_dir
+        for entry_index in range(len(member.get("entries", []))):
+            by_week = {}
+            for pick in resolve_picks(member, all_weeks, entry_index):
+                if pick['result'] != "UNDECIDED":
+                    by_week.setdefault(pick['week'], []).append({'line': pick['line'], 'won': pick['won']})
+            
+            segments = streams.setdefault(entry_index, [])
+            for week in sorted(by_week):
+                segments.append((season, week, by_week[week]))
+    
+    return [{'entry': entry_index, 'segments': segments}
+            for entry_index, segments in sorted(streams.items()) if segments]
+
+
+def fit_strategy_params(train_picks):
+    """Fit the win rate and category ROI table from training picks."""
+    wins = sum(1 for p in train_picks if p['won'])
+    win_rate = wins / len(train_picks)
+    
+    category_units = {category: [0, 0] for category in CONFIDENCE_CATEGORY_ROI}
+    for pick in train_picks:
+        totals = category_units[categorize_line(pick['line'])]
+        totals[0] += line_payout(pick['line']) if pick['won'] else -1
+        totals[1] += 1
+    
+    category_roi = {
+        category: (unit_profit / count * 100 if count else 0)
+        for category, (unit_profit, count) in category_units.items()
+    }
+    return win_rate, dict(DEFAULT_STRATEGY_PARAMS, category_roi=category_roi)
+
+
+def run_strategies(picks, win_rate, params, starting_bankroll=1000, bet_amount=100):
+    """Simulate every strategy over `picks` with fixed parameters."""
+    strategies = init_strategy_states(starting_bankroll, bet_amount, params=params)
+    for pick in picks:
+        step_strategies(strategies, pick['line'], pick['won'], win_rate, starting_bankroll, bet_amount, params)
+    return format_strategies(strategies, starting_bankroll, risk_metrics=False)
+
+
+def _init_backtest_worker(streams):
+    global _BACKTEST_STREAMS
+    _BACKTEST_STREAMS = streams
+
+
+def run_backtest_fold(task):
+    """
+    Tune on segments [0, k) of a stream and evaluate on segment k.
+
+    Every grid combination is simulated on the training window, each
+    strategy keeps the combination with the best training ROI, and the
+    chosen parameters are then run out of sample on the test segment.
+    """
+    stream_index, k, starting_bankroll, bet_amount = task
+    stream = _BACKTEST_STREAMS[stream_index]
+    train_picks = [p for _, _, picks in stream['segments'][:k] for p in picks]
+    season, week, test_picks = stream['segments'][k]
+    
+    win_rate, base_params = fit_strategy_params(train_picks)
+    
+    best = {}
+    grid_keys = list(BACKTEST_GRID)
+    for values in itertools.product(*(BACKTEST_GRID[key] for key in grid_keys)):
+        params = dict(base_params, **dict(zip(grid_keys, values)))
+        for strategy in run_strategies(train_picks, win_rate, params, starting_bankroll, bet_amount):
+            key = strategy['strategy_key']
+            if key not in best or strategy['roi'] > best[key][0]:
+                best[key] = (strategy['roi'], values)
+    
+    results = {}
+    for values in set(values for _, values in best.values()):
+        params = dict(base_params, **dict(zip(grid_keys, values)))
+        for strategy in run_strategies(test_picks, win_rate, params, starting_bankroll, bet_amount):
+            key = strategy['strategy_key']
+            if best[key][1] == values:
+                results[key] = {
+                    'name': strategy['name'],
+                    'params': {param: value for param, value in zip(grid_keys, values)
+                               if BACKTEST_PARAM_STRATEGIES[param] == key},
+                    'roi': strategy['roi'],
+                    'profit': strategy['profit'],
+                    'max_drawdown': strategy['max_drawdown']
+                }
+    
+    return {
+        'entry': stream['entry'],
+        'season': season,
+        'week': week,
+        'train_picks': len(train_picks),
+        'test_picks': len(test_picks),
+        'strategies': results
+    }
+
+
+def walk_forward_backtest(season_dirs, starting_bankroll=1000, bet_amount=100, min_train_weeks=1, workers=None):
+    """
+    Walk-forward backtest of the bankroll strategies across seasons and entries.
+
+    Pick tables are resolved once and shared with a process pool; each
+    fold (one entry, one held-out week) runs as an independent task.
+    Returns the per-fold results and out-of-sample totals per strategy.
+    """
+    streams = load_backtest_streams(season_dirs)
+    tasks = [
+        (stream_index, k, starting_bankroll, bet_amount)
+        for stream_index, stream in enumerate(streams)
+        for k in range(min_train_weeks, len(stream['segments']))
+    ]
+    
+    if not tasks:
+        print("Warning: Not enough completed weeks to backtest!")
+        return {'folds': [], 'strategies': []}
+    
+    print(f"Backtesting {len(tasks)} folds across {len(streams)} entries and {len(season_dirs)} seasons...")
+    
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_backtest_worker, initargs=(streams,)
+    ) as executor:
+        folds = list(executor.map(run_backtest_fold, tasks, chunksize=max(1, len(tasks) // 64)))
+    
+    summary = {}
+    for fold in folds:
+        for key, result in fold['strategies'].items():
+            totals = summary.setdefault(key, {
+                'names': set(), 'strategy_key': key, 'folds': 0,
+                'roi_sum': 0, 'profit': 0, 'worst_drawdown': 0, 'drawdown_sum': 0
+            })
+            totals['names'].add(result['name'])
+            totals['folds'] += 1
+            totals['roi_sum'] += result['roi']
+            totals['profit'] += result['profit']
+            totals['drawdown_sum'] += result['max_drawdown']
+            totals['worst_drawdown'] = max(totals['worst_drawdown'], result['max_drawdown'])
+    
+    strategies_output = []
+    for key, totals in summary.items():
+        # Names that carry a tuned parameter can differ between folds
+        if len(totals['names']) == 1:
+            name = totals['names'].pop()
+        else:
+            name = key.replace('_', ' ').title() + ' (tuned)'
+        strategies_output.append({
+            'name': name,
+            'strategy_key': totals['strategy_key'],
+            'folds': totals['folds'],
+            'avg_oos_roi': round(totals['roi_sum'] / totals['folds'], 1),
+            'total_oos_profit': round(totals['profit'], 2),
+            'avg_max_drawdown': round(totals['drawdown_sum'] / totals['folds'], 2),
+            'worst_max_drawdown': round(totals['worst_drawdown'], 2)
+        })
+    strategies_output.sort(key=lambda s: s['avg_oos_roi'], reverse=True)
+    
+    return {'folds': folds, 'strategies': strategies_output}
+
+
+def print_backtest_report(report):
+    """Print out-of-sample backtest results per strategy."""
+    print("\n" + "=" * 70)
+    print("WALK-FORWARD BACKTEST (OUT-OF-SAMPLE)")
+    print("=" * 70)
+    print(f"{'Strategy':<34} {'Folds':>5} {'Avg ROI':>9} {'Profit':>12} {'Worst DD':>10}")
+    for strategy in report['strategies']:
+        print(f"{strategy['name']:<34} {strategy['folds']:>5} {strategy['avg_oos_roi']:>8.1f}% "
+              f"${strategy['total_oos_profit']:>11.2f} ${strategy['worst_max_drawdown']:>9.2f}")
+    print("=" * 70)
+
+
+def implied_probability(line):
+    """Break-even win probability implied by an American line."""
+    return 1 / (1 + line_payout(line))
+
+
+def probability_to_line(probability):
+    """Convert a win probability to an American line."""
+    if probability >= 0.5:
+        return -100 * probability / (1 - probability) if probability < 1 else -9999
+    return 100 * (1 - probability) / probability if probability > 0 else 9999
+
+
+def add_market_columns(resolved):
+    """
+    Return copies of the resolved picks with market columns added.
+
+    implied_prob is the break-even probability of the picked line, vig is
+    the proposition's overround, and fair_prob / fair_line remove the vig
+    by normalizing over all outcomes. No closing line is available, so
+    edge measures the price taken against the league instead of the same
+    lines: pick_share - implied_prob, positive when more of the league
+    picked the outcome than the line implied. It is None without pick counts.
+    Picks are consensus when most of the league picked the same outcome,
+    or, without pick counts, when they took the market favorite.
+    """
+    implied = [implied_probability(p['line']) for p in resolved]
+    overround = [
+        imp + sum(implied_probability(line) for line in p['other_lines']) if p['other_lines'] else None
+        for imp, p in zip(implied, resolved)
+    ]
+    fair = [imp / total if total else imp for imp, total in zip(implied, overround)]
+    
+    market_picks = []
+    for pick, implied_prob, total, fair_prob in zip(resolved, implied, overround, fair):
+        pick = dict(pick)
+        pick['implied_prob'] = implied_prob
+        pick['vig'] = total - 1 if total else None
+        pick['fair_prob'] = fair_prob
+        pick['fair_line'] = probability_to_line(fair_prob)
+        pick['edge'] = pick['pick_share'] - implied_prob if pick['pick_share'] is not None else None
+        if pick['pick_share'] is not None:
+            pick['consensus'] = pick['pick_share'] >= 0.5
+        else:
+            pick['consensus'] = fair_prob >= 0.5
+        market_picks.append(pick)
+    
+    return market_picks
+
+
+def new_market_totals():
+    """Create empty running sums for the market analysis."""
+    return {
+        'vig_sum': 0,
+        'vig_count': 0,
+        'has_pick_share': False,
+        'groups': {
+            group: {'picks': 0, 'wins': 0, 'unit_profit': 0, 'fair_prob': 0, 'edge': 0, 'edge_picks': 0}
+            for group in ('overall', 'consensus', 'contrarian')
+        }
+    }
+
+
+def add_market_pick(totals, pick):
+    """Fold one settled pick, with its add_market_columns columns, into the market totals."""
+    if pick['vig'] is not None:
+        totals['vig_sum'] += pick['vig']
+        totals['vig_count'] += 1
+    if pick['pick_share'] is not None:
+        totals['has_pick_share'] = True
+    
+    for group in ('overall', 'consensus' if pick['consensus'] else 'contrarian'):
+        data = totals['groups'][group]
+        data['picks'] += 1
+        data['wins'] += 1 if pick['won'] else 0
+        data['unit_profit'] += pick['unit_profit']
+        data['fair_prob'] += pick['fair_prob']
+        if pick['edge'] is not None:
+            data['edge'] += pick['edge']
+            data['edge_picks'] += 1
+
+
+def summarize_market_totals(totals):
+    """Turn market totals into the market_analysis section."""
+    def summarize(data):
+        count = data['picks']
+        return {
+            'picks': count,
+            'wins': data['wins'],
+            'win_rate': round(data['wins'] / count * 100, 1) if count else 0,
+            'expected_win_rate': round(data['fair_prob'] / count * 100, 1) if count else 0,
+            'avg_edge': round(data['edge'] / data['edge_picks'] * 100, 2) if data['edge_picks'] else None,
+            'roi': round(data['unit_profit'] / count * 100, 1) if count else 0
+        }
+    
+    groups = totals['groups']
+    return {
+        'consensus_source': 'pick_share' if totals['has_pick_share'] else 'market_favorite',
+        'avg_vig': round(totals['vig_sum'] / totals['vig_count'] * 100, 2) if totals['vig_count'] else None,
+        'overall': summarize(groups['overall']),
+        'by_consensus': [
+            dict(summarize(groups['consensus']), group='consensus'),
+            dict(summarize(groups['contrarian']), group='contrarian')
+        ]
+    }
+
+
+def calculate_market_analysis(resolved):
+    """Summarize implied odds, vig, edge and consensus vs. contrarian performance for settled picks."""
+    totals = new_market_totals()
+    for pick in add_market_columns(resolved):
+        if pick['result'] != "UNDECIDED":
+            add_market_pick(totals, pick)
+    return summarize_market_totals(totals)
+
+
+def print_market_analysis(analysis):
+    """Print the consensus vs. contrarian market analysis."""
+    print("\n" + "=" * 70)
+    print("MARKET ANALYSIS")
+    print("=" * 70)
+    if analysis['avg_vig'] is not None:
+        print(f"Average vig: {analysis['avg_vig']:.2f}%")
+    print(f"Consensus defined by: {analysis['consensus_source'].replace('_', ' ')}")
+    print("Edge: league pick share minus the implied probability of the line taken")
+    print("      (no closing line available; n/a without pick counts)")
+    print()
+    print(f"{'Group':<12} {'Picks':>6} {'Win %':>7} {'Fair %':>7} {'Edge':>7} {'ROI':>7}")
+    for group in [dict(analysis['overall'], group='all')] + analysis['by_consensus']:
+        edge = f"{group['avg_edge']:>6.2f}%" if group['avg_edge'] is not None else f"{'n/a':>7}"
+        print(f"{group['group']:<12} {group['picks']:>6} {group['win_rate']:>6.1f}% {group['expected_win_rate']:>6.1f}% "
+              f"{edge} {group['roi']:>6.1f}%")
+    print("=" * 70)
+
+
+def format_overall(stats):
+    """Format analyze_picks stats for the 'overall' export section."""
+    return {
+        'total_picks': stats['total_picks'],
+        'wins': stats['wins'],
+        'losses': stats['losses'],
+        'win_rate': round(stats['win_rate'], 1),
+        'total_winnings': round(stats['total_winnings'], 2),
+        'total_losses': round(stats['total_losses'], 2),
+        'net_profit': round(stats['net_profit'], 2),
+        'roi': round(stats['roi'], 1),
+        'avg_win': round(stats['avg_win'], 2),
+        'avg_loss': round(stats['avg_loss'], 2),
+        'biggest_win': round(stats['biggest_win'], 2),
+        'biggest_loss': round(stats['biggest_loss'], 2)
+    }
+
+
+def format_line_ranges(line_range_stats, bet_amount=100):
+    """Format line range stats for the 'by_line_range' export section."""
     line_ranges_export = []
     for category, data in line_range_stats.items():
         total_bets = data['wins'] + data['losses']
@@ -780,34 +1574,655 @@ def export_stats_to_json(stats, member, all_weeks_data, bet_amount=100):
             'profit': round(data['profit'], 2),
             'roi': round((data['profit'] / (bet_amount * total_bets) * 100), 1) if total_bets > 0 else 0
         })
-    
-    # Build stats object
+    return line_ranges_export
+
+
+def build_stats_output(stats, line_range_stats, weekly_stats, streak_stats, bankroll_strategies, bet_amount=100,
+                       market_analysis=None):
+    """Assemble the stats_output.json document from the computed sections."""
     output = {
-        'overall': {
-            'total_picks': stats['total_picks'],
-            'wins': stats['wins'],
-            'losses': stats['losses'],
-            'win_rate': round(stats['win_rate'], 1),
-            'total_winnings': round(stats['total_winnings'], 2),
-            'total_losses': round(stats['total_losses'], 2),
-            'net_profit': round(stats['net_profit'], 2),
-            'roi': round(stats['roi'], 1),
-            'avg_win': round(sum(wins_only) / len(wins_only), 2) if wins_only else 0,
-            'avg_loss': round(sum(losses_only) / len(losses_only), 2) if losses_only else 0,
-            'biggest_win': round(max(all_profits), 2) if all_profits else 0,
-            'biggest_loss': round(min(all_profits), 2) if all_profits else 0
-        },
-        'by_line_range': line_ranges_export,
+        'overall': format_overall(stats),
+        'by_line_range': format_line_ranges(line_range_stats, bet_amount),
         'weekly': weekly_stats,
         'streaks': streak_stats,
         'bankroll_strategies': bankroll_strategies
     }
+    if market_analysis is not None:
+        output['market_analysis'] = market_analysis
+    
+    return output
+
+
+def write_json_sections(sections, path=STATS_FILE):
+    """
+    Stream (key, value) sections into a compact JSON object at `path`.
+
+    A value may be an iterator (such as a generator), in which case it is
+    written as a JSON array one item at a time, so its items never have to
+    be held in memory together. The document is written to a temporary
+    file and renamed into place, so readers never see a partial file.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for i, (key, value) in enumerate(sections):
+                f.write((',' if i else '') + json.dumps(key) + ':')
+                if isinstance(value, collections.abc.Iterator):
+                    f.write('[')
+                    for j, item in enumerate(value):
+                        if j:
+                            f.write(',')
+                        f.write(json.dumps(item, separators=(',', ':')))
+                    f.write(']')
+                else:
+                    f.write(json.dumps(value, separators=(',', ':')))
+            f.write('}')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return path
+
+
+def export_stats_to_json(stats, member, all_weeks_data, bet_amount=100, starting_bankroll=1000, resolved=None):
+    """
+    Export comprehensive stats to JSON file.
+
+    The picks are resolved once (or `resolved` is reused) and every section
+    is computed from that shared table. The bankroll strategies are
+    simulated one at a time as the writer streams them, so only one
+    strategy history is in memory at once.
+    """
+    if resolved is None:
+        resolved = resolve_picks(member, all_weeks_data)
+    
+    return write_json_sections([
+        ('overall', format_overall(stats)),
+        ('by_line_range', format_line_ranges(
+            calculate_line_range_stats(member, all_weeks_data, bet_amount, resolved), bet_amount)),
+        ('weekly', calculate_weekly_stats(member, all_weeks_data, bet_amount, resolved)),
+        ('streaks', calculate_streak_stats(member, all_weeks_data, bet_amount, resolved)),
+        ('market_analysis', calculate_market_analysis(resolved)),
+        ('bankroll_strategies', simulate_bankroll_strategies(
+            member, all_weeks_data, starting_bankroll, bet_amount, resolved, stream=True))
+    ], STATS_FILE)
+
+
+def read_events(log_path=EVENT_LOG_FILE, offset=0):
+    """
+    Read pick events appended to the log after byte `offset`.
+
+    Returns the events and the byte offset just past the last complete
+    line. A trailing partial line (left by a crash mid-append) is
+    truncated so the next append starts on a clean line.
+    """
+    if not os.path.exists(log_path):
+        return [], 0
+    
+    with open(log_path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    
+    complete = data.rfind(b'\n') + 1
+    if complete < len(data):
+        with open(log_path, 'r+b') as f:
+            f.truncate(offset + complete)
+    
+    events = [json.loads(line) for line in data[:complete].splitlines() if line.strip()]
+    return events, offset + complete
+
+
+def append_events(events, log_path=EVENT_LOG_FILE):
+    """Append events (or history rows) to a JSON Lines file, one per line, and return the new file size."""
+    with open(log_path, 'a', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event, separators=(',', ':')) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    return os.path.getsize(log_path)
+
+
+def new_aggregate_state(bet_amount=100, starting_bankroll=1000):
+    """
+    Create empty incremental aggregates for an event log.
+
+    The log holds the settled picks of the entry in pick order, up to
+    `next_index`, the first pick that was not settled yet. `totals` holds
+    the running flat, line range, weekly, streak and market sums, and
+    `strategies` the bankroll, bet size and running risk sums of every
+    strategy except the HINDSIGHT_STRATEGIES. `pending` holds the resolved
+    picks from `next_index` on, which are folded into a copy of the
+    aggregates at export time. The weekly, line range and strategy state is
+    in dollars, so it is only valid for its stake and starting bankroll.
+    """
+    strategies = init_strategy_states(starting_bankroll, bet_amount,
+                                      [key for key in strategy_names() if key not in HINDSIGHT_STRATEGIES])
+    for strategy in strategies.values():
+        strategy['history'] = []
+        strategy['risk'] = extend_risk_state(new_risk_state(), [starting_bankroll])
+    
+    return {
+        'bet_amount': bet_amount,
+        'starting_bankroll': starting_bankroll,
+        'offset': 0,
+        'history_offset': 0,
+        'next_index': 0,
+        'logged': 0,
+        'pending': [],
+        'totals': {
+            'overall': new_flat_totals(),
+            'by_line_range': new_line_range_totals(),
+            'weekly': {},
+            'streaks': new_streak_state(),
+            'market': new_market_totals()
+        },
+        'strategies': strategies
+    }
+
+
+def fold_pick(totals, pick, bet_amount=100):
+    """Add one resolved pick, in pick order, to the running totals."""
+    add_flat_pick(totals['overall'], pick)
+    add_line_range_pick(totals['by_line_range'], pick, bet_amount)
+    add_weekly_pick(totals['weekly'], pick, bet_amount)
+    add_streak_pick(totals['streaks'], pick)
+    if pick['result'] != "UNDECIDED":
+        add_market_pick(totals['market'], add_market_columns([pick])[0])
+
+
+def advance_strategies(strategies, pick, starting_bankroll=1000, bet_amount=100):
+    """
+    Advance the checkpointed strategies by one settled pick.
+
+    Each new bankroll is folded into the strategy's running risk sums
+    instead of being kept in its history. Returns the new bankrolls, in
+    strategy order, rounded as they are exported.
+    """
+    # None of these strategies uses the win rate
+    apply_pick(strategies, pick_context(pick['line'], pick['won'], 0), starting_bankroll, bet_amount)
+    
+    bankrolls = []
+    for strategy in strategies.values():
+        bankroll = strategy['history'].pop()
+        extend_risk_state(strategy['risk'], [bankroll])
+        bankrolls.append(round(bankroll, 2))
+    return bankrolls
+
+
+def apply_event(state, event):
+    """Fold one settled pick event into the aggregate state and return its history row."""
+    event = dict(event, week=normalize_week(event['week']))
+    fold_pick(state['totals'], event, state['bet_amount'])
+    state['next_index'] = event['pick_index'] + 1
+    state['logged'] += 1
+    
+    bankrolls = advance_strategies(state['strategies'], event, state['starting_bankroll'], state['bet_amount'])
+    return [event['line'], event['won'], bankrolls]
+
+
+def load_checkpoint(checkpoint_path=CHECKPOINT_FILE):
+    """Load checkpointed aggregates, or None if there is no usable checkpoint."""
+    if not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Checkpoints written before the running strategy state or the pick-share
+    # edge cannot be resumed; their aggregates are rebuilt from the log
+    if 'next_index' not in state or 'edge_picks' not in state['totals']['market']['groups']['overall']:
+        return None
+    
+    # JSON object keys are strings, and older checkpoints may hold string weeks
+    state['totals']['weekly'] = {
+        normalize_week(week): dict(data, week=normalize_week(data['week']))
+        for week, data in state['totals']['weekly'].items()
+    }
+    for pick in state['pending']:
+        pick['week'] = normalize_week(pick['week'])
+    return state
+
+
+def save_checkpoint(state, checkpoint_path=CHECKPOINT_FILE):
+    """Write the aggregates atomically so a crash never leaves a torn checkpoint."""
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def update_incremental(member, all_weeks_data, bet_amount=100, starting_bankroll=1000,
+                       log_path=EVENT_LOG_FILE, checkpoint_path=CHECKPOINT_FILE, history_path=HISTORY_FILE):
+    """
+    Log newly settled picks and bring the checkpointed aggregates up to date.
+
+    Events appended since the checkpoint are replayed, then only the picks
+    from the checkpoint's `next_index` on are resolved. Settled picks are
+    logged in pick order, up to the first one that is still undecided or
+    whose week is not in the data yet, so the running streaks and bankrolls
+    see them in the same order as a full export. Each logged pick advances
+    the running totals and strategies, and the rounded strategy bankrolls
+    after it are appended to the history file, so the work per run is
+    proportional to the new picks. The proposition index of the cached
+    weeks is still rebuilt on every run.
+
+    A missing or unreadable checkpoint, a log or history file shorter than
+    the checkpoint says, or a different stake or starting bankroll, falls
+    back to replaying the whole log.
+    """
+    state = load_checkpoint(checkpoint_path)
+    log_size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+    history_size = os.path.getsize(history_path) if os.path.exists(history_path) else 0
+    if (state is None or state['offset'] > log_size or state['history_offset'] > history_size
+            or state['bet_amount'] != bet_amount or state['starting_bankroll'] != starting_bankroll):
+        state = new_aggregate_state(bet_amount, starting_bankroll)
+    
+    # Drop history rows written after the checkpoint; they are rebuilt from the log
+    if history_size > state['history_offset']:
+        with open(history_path, 'r+b') as f:
+            f.truncate(state['history_offset'])
+    
+    # Recover events logged after the last checkpoint
+    recovered, state['offset'] = read_events(log_path, state['offset'])
+    history_rows = [apply_event(state, event) for event in recovered]
+    
+    picks = member['entries'][0]['picks']
+    prop_index = build_proposition_index(all_weeks_data)
+    resolved = resolve_picks(member, all_weeks_data, first_pick=state['next_index'], prop_index=prop_index)
+    
+    # Hold back everything from the first pick that may still change
+    held = [pick['pick_index'] for pick in resolved if pick['result'] == "UNDECIDED"]
+    held += [i for i in range(state['next_index'], len(picks)) if picks[i]['propositionId'] not in prop_index]
+    next_index = min(held, default=len(picks))
+    
+    new_events = [pick for pick in resolved if pick['pick_index'] < next_index]
+    if new_events:
+        state['offset'] = append_events(new_events, log_path)
+        history_rows += [apply_event(state, event) for event in new_events]
+    if history_rows:
+        state['history_offset'] = append_events(history_rows, history_path)
+    
+    state['next_index'] = next_index
+    state['pending'] = [pick for pick in resolved if pick['pick_index'] >= next_index]
+    
+    print(f"Event log: {len(recovered)} recovered, {len(new_events)} new, "
+          f"{state['logged']} total settled picks")
+    
+    save_checkpoint(state, checkpoint_path)
+    return state
+
+
+def incremental_totals(state):
+    """
+    Return the totals with the pending picks folded in.
+
+    A full export counts undecided picks as losses in the flat, line
+    range, weekly and streak stats, so the incremental export does the
+    same on a copy.
+    """
+    if not state['pending']:
+        return state['totals']
+    
+    totals = copy.deepcopy(state['totals'])
+    for pick in state['pending']:
+        fold_pick(totals, pick, state['bet_amount'])
+    return totals
+
+
+def stats_from_state(state):
+    """Convert incremental aggregates into the analyze_picks stats dict."""
+    return flat_stats_from_totals(incremental_totals(state)['overall'], state['bet_amount'])
+
+
+def incremental_strategies(state, history_path=HISTORY_FILE):
+    """
+    Format the bankroll strategies from the checkpointed state and history file.
+
+    The settled pending picks advance a copy of the running strategies.
+    Kelly sizing uses the win rate over every settled pick, so the
+    HINDSIGHT_STRATEGIES are re-simulated from the logged lines.
+    """
+    bet_amount = state['bet_amount']
+    starting_bankroll = state['starting_bankroll']
+    strategies = copy.deepcopy(state['strategies'])
+    
+    rows, _ = read_events(history_path)
+    for pick in state['pending']:
+        if pick['result'] != "UNDECIDED":
+            rows.append([pick['line'], pick['won'], advance_strategies(strategies, pick, starting_bankroll, bet_amount)])
+    if not rows:
+        return []
+    
+    win_rate = sum(1 for _, won, _ in rows if won) / len(rows)
+    hindsight = init_strategy_states(starting_bankroll, bet_amount, HINDSIGHT_STRATEGIES)
+    for line, won, _ in rows:
+        apply_pick(hindsight, pick_context(line, won, win_rate), starting_bankroll, bet_amount)
+    
+    for i, strategy in enumerate(strategies.values()):
+        strategy['history'] = [starting_bankroll] + [bankrolls[i] for _, _, bankrolls in rows]
+    
+    ordered = {}
+    risk = []
+    for key in strategy_names(bet_amount):
+        if key in hindsight:
+            ordered[key] = hindsight[key]
+            risk.append(calculate_risk_metrics(hindsight[key]['history']))
+        else:
+            ordered[key] = strategies[key]
+            risk.append(risk_metrics_from_state(strategies[key]['risk']))
+    
+    return format_strategies(ordered, starting_bankroll, risk=risk)
+
+
+def export_stats_from_state(state, history_path=HISTORY_FILE):
+    """
+    Export stats_output.json from incremental aggregates.
+
+    The output matches a full export of the same picks. Only the strategy
+    histories are read back from the history file, since the export
+    contains them.
+    """
+    bet_amount = state['bet_amount']
+    totals = incremental_totals(state)
+    
+    return write_json_sections([
+        ('overall', format_overall(flat_stats_from_totals(totals['overall'], bet_amount))),
+        ('by_line_range', format_line_ranges(totals['by_line_range'], bet_amount)),
+        ('weekly', format_weekly(totals['weekly'])),
+        ('streaks', format_streaks(totals['streaks'])),
+        ('market_analysis', summarize_market_totals(totals['market'])),
+        ('bankroll_strategies', incremental_strategies(state, history_path))
+    ], STATS_FILE)
+
+
+def downsample_series(values, max_points=MAX_CHART_POINTS):
+    """Keep every n-th point so a series has at most `max_points` values, like the dashboard does."""
+    if len(values) <= max_points:
+        return values
+    step = -(-len(values) // max_points)
+    return values[::step]
+
+
+def export_html(stats_path=STATS_FILE, output_path=HTML_EXPORT_FILE):
+    """
+    Write a self-contained dashboard that opens straight from disk.
+
+    The vendored, already minified Chart.js build is inlined in place of
+    the CDN script, strategy histories are downsampled to MAX_CHART_POINTS, and
+    the stats are embedded as gzipped, base64-encoded compact JSON. Raises
+    ValueError if the dashboard template no longer contains CHART_CDN_TAG.
+    """
+    with open(stats_path, encoding='utf-8') as f:
+        stats = json.load(f)
+    
+    for strategy in stats.get('bankroll_strategies', []):
+        strategy['history'] = downsample_series(strategy['history'])
+    
+    payload = json.dumps(stats, separators=(',', ':')).encode('utf-8')
+    encoded = base64.b64encode(gzip.compress(payload, mtime=0)).decode('ascii')
+    
+    with open(DASHBOARD_TEMPLATE, encoding='utf-8') as f:
+        template = f.read()
+    if CHART_CDN_TAG not in template:
+        raise ValueError(f"{DASHBOARD_TEMPLATE} does not load Chart.js with the expected tag {CHART_CDN_TAG}; "
+                         f"update CHART_CDN_TAG and the vendored {CHART_LIBRARY} to match it")
+    with open(CHART_LIBRARY, encoding='utf-8') as f:
+        chart_library = f.read()
+    
+    html = template.replace(
+        CHART_CDN_TAG,
+        f'<script>{chart_library}</script>\n<script id="embedded-stats" type="application/octet-stream">{encoded}</script>'
+    )
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    
+    return output_path
+
+
+class LRUCache:
+    """Thread-safe LRU cache of encoded responses, bounded by their total size in bytes."""
+    
+    def __init__(self, max_bytes=DAEMON_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            if len(value) > self.max_bytes:
+                return
+            self.entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class AnalyticsStore:
+    """
+    Datasets and resolved pick tables held in memory by the analytics daemon.
+
+    Query results are cached as encoded JSON. Both the datasets and the
+    cache are dropped and reloaded whenever the cache files change on disk.
+    Every reload bumps `generation`, which is part of each cache key, so a
+    query computed from the previous data is never cached after a reload.
+    """
+    
+    def __init__(self, member_file=MEMBER_FILE, weeks_file=WEEKS_FILE, cache_bytes=DAEMON_CACHE_BYTES):
+        self.member_file = member_file
+        self.weeks_file = weeks_file
+        self.cache = LRUCache(cache_bytes)
+        self.lock = threading.Lock()
+        self.signature = None
+        self.generation = 0
+        self.member = None
+        self.all_weeks = None
+        self.resolved = {}
+    
+    def file_signature(self):
+        return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size)
+                     for path in (self.member_file, self.weeks_file))
+    
+    def refresh(self):
+        """Reload the datasets and invalidate cached results if the cache files changed."""
+        signature = self.file_signature()
+        if signature == self.signature:
+            return
+        with self.lock:
+            if signature == self.signature:
+                return
+            with open(self.member_file) as f:
+                self.member = json.load(f)
+            with open(self.weeks_file) as f:
+                self.all_weeks = json.load(f)
+            self.resolved = {}
+            self.cache.clear()
+            self.signature = signature
+            self.generation += 1
+            print(f"Loaded {self.member_file} and {self.weeks_file}")
+    
+    def resolved_picks(self, entry_index):
+        """Return the data generation and the resolved picks of an entry, taken together."""
+        with self.lock:
+            if entry_index not in self.resolved:
+                self.resolved[entry_index] = resolve_picks(self.member, self.all_weeks, entry_index)
+            return self.generation, self.resolved[entry_index]
+    
+    def query(self, bet_amount=100, starting_bankroll=1000, entry_index=0, weeks=None, strategies=None):
+        """Return the stats document for a query as encoded JSON, from cache when possible."""
+        self.refresh()
+        generation, resolved = self.resolved_picks(entry_index)
+        key = (generation, bet_amount, starting_bankroll, entry_index, weeks, strategies)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if weeks is not None:
+            first, last = weeks
+            resolved = [p for p in resolved if first <= p['week'] <= last]
+        completed = [p for p in resolved if p['result'] != "UNDECIDED"]
+        
+        bankroll_strategies = simulate_bankroll_batch(completed, [starting_bankroll], bet_amount)[0]
+        if strategies is not None:
+            bankroll_strategies = [s for s in bankroll_strategies if s['strategy_key'] in strategies]
+        
+        output = build_stats_output(
+            summarize_flat_stats(resolved, bet_amount),
+            calculate_line_range_stats(None, None, bet_amount, resolved=resolved),
+            calculate_weekly_stats(None, None, bet_amount, resolved=resolved),
+            calculate_streak_stats(None, None, bet_amount, resolved=resolved),
+            bankroll_strategies,
+            bet_amount,
+            calculate_market_analysis(resolved)
+        )
+        
+        encoded = json.dumps(output, separators=(',', ':')).encode('utf-8')
+        with self.lock:
+            # Don't cache a result computed from data that has since been reloaded
+            if generation == self.generation:
+                self.cache.put(key, encoded)
+        return encoded
+
+
+def parse_number(value):
+    """Parse a query number, keeping integral values as ints."""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def parse_stats_query(query, bet_amount=100, starting_bankroll=1000):
+    """
+    Turn /stats query parameters into AnalyticsStore.query keyword arguments.
+
+    `bet_amount` and `starting_bankroll` are used when the query leaves them
+    out. Raises ValueError for malformed or non-positive amounts.
+    """
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    kwargs = {
+        'bet_amount': parse_number(params.get('bet_amount', bet_amount)),
+        'starting_bankroll': parse_number(params.get('bankroll', starting_bankroll)),
+        'entry_index': int(params.get('entry', 0))
+    }
+    
+    for name, key in (('bet_amount', 'bet_amount'), ('bankroll', 'starting_bankroll')):
+        if not 0 < kwargs[key] < float('inf'):
+            raise ValueError(f"{name} must be a positive number")
+    
+    if 'weeks' in params:
+        first, _, last = params['weeks'].partition('-')
+        kwargs['weeks'] = (int(first), int(last or first))
+    
+    if 'strategies' in params:
+        kwargs['strategies'] = tuple(sorted(s for s in params['strategies'].split(',') if s))
     
-    # Write to JSON
-    with open('stats_output.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2)
+    return kwargs
+
+
+class AnalyticsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Answer analytics queries and serve the dashboard from an AnalyticsStore."""
+    
+    # Set by run_daemon
+    store = None
+    bet_amount = 100
+    starting_bankroll = 1000
+    
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        
+        if parsed.path in ('/', '/dashboard.html'):
+            with open(DASHBOARD_TEMPLATE, 'rb') as f:
+                self.send_body(200, f.read(), 'text/html; charset=utf-8')
+            return
+        
+        if parsed.path == '/health':
+            cache = self.store.cache
+            body = {'status': 'ok', 'cached_queries': len(cache.entries), 'cache_bytes': cache.size}
+            self.send_body(200, json.dumps(body).encode('utf-8'))
+            return
+        
+        if parsed.path not in ('/stats', '/stats_output.json'):
+            self.send_body(404, b'{"error":"Not found"}')
+            return
+        
+        try:
+            query = parse_stats_query(parsed.query, self.bet_amount, self.starting_bankroll)
+        except ValueError as e:
+            self.send_body(400, json.dumps({'error': f'Bad query: {e}'}).encode('utf-8'))
+            return
+        
+        try:
+            body = self.store.query(**query)
+        except (OSError, json.JSONDecodeError) as e:
+            # The cache files are missing or being replaced; the client can retry
+            self.send_body(503, json.dumps({'error': f'Data unavailable: {e}'}).encode('utf-8'))
+            return
+        except (ValueError, IndexError, KeyError) as e:
+            self.send_body(400, json.dumps({'error': f'Bad query: {e}'}).encode('utf-8'))
+            return
+        self.send_body(200, body)
+    
+    def send_body(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def run_daemon(port=8000, cache_bytes=DAEMON_CACHE_BYTES, bet_amount=100, starting_bankroll=1000):
+    """Serve analytics queries from in-memory data until interrupted."""
+    store = AnalyticsStore(cache_bytes=cache_bytes)
+    store.refresh()
     
-    return 'stats_output.json'
+    handler = type('BoundAnalyticsRequestHandler', (AnalyticsRequestHandler,), {
+        'store': store,
+        'bet_amount': bet_amount,
+        'starting_bankroll': starting_bankroll
+    })
+    with http.server.ThreadingHTTPServer(("127.0.0.1", port), handler) as httpd:
+        print(f"Analytics daemon running at http://localhost:{port}")
+        print(f"  Dashboard: http://localhost:{port}/dashboard.html")
+        print(f"  Query:     http://localhost:{port}/stats?bet_amount=50&bankroll=2500&weeks=1-8")
+        print("Press Ctrl+C to stop the daemon")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopping daemon...")
+
+
+def positive_float(value):
+    """argparse type for stakes and bankrolls, which must be positive."""
+    number = float(value)
+    if not 0 < number < float('inf'):
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value}")
+    return number
 
 
 def main():
@@ -818,29 +2233,163 @@ def main():
         --refetch : Optional flag that forces data to be re-fetched instead of
                     using cached data. Useful when the source data may have changed
                     or needs to be refreshed.
+        --api-base : Base URL of the gambit API, e.g. a local mock_espn_api.py
+                     server (default: $BETKEEPER_API_BASE or the ESPN API).
+        --bet-amount : Flat stake per pick used for the stats and as the base
+                       bet of the bankroll strategies (default 100).
+        --bankroll : Starting bankroll for the strategy simulations (default 1000).
+        --incremental : Record settled picks in the append-only event log and
+                        update stats_output.json from checkpointed aggregates,
+                        replaying only picks added since the last checkpoint.
+        --backtest : Walk-forward backtest the bankroll strategies over one or more
+                     season cache directories and exit.
+        --export-html : Write a self-contained dashboard HTML file (default
+                        betkeeper_dashboard.html) and open it from disk instead
+                        of starting the local server.
+        --daemon : Keep the data in memory and answer /stats queries over a
+                   local HTTP API (with an LRU result cache) instead of exporting.
+                   Queries default to --bet-amount and --bankroll.
+        --port : Port for the local dashboard server or the daemon (default 8000).
+        --market-analysis : Print implied odds, vig-free fair odds, edge and
+                            consensus vs. contrarian performance and exit.
+        --what-if-bets / --what-if-bankrolls : Print what-if tables for several
+                       stakes and/or starting bankrolls and exit, without
+                       exporting stats or starting the server.
     """
+    global API_BASE_URL
+    
     parser = argparse.ArgumentParser(description="Analyze and export betting stats.")
     parser.add_argument(
         "--refetch",
         action="store_true",
         help="Force data to be re-fetched instead of using cached data. (needs to be done for new weeks)"
     )
+    parser.add_argument(
+        "--api-base",
+        default=API_BASE_URL,
+        help="Base URL of the gambit API (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--bet-amount",
+        type=positive_float,
+        default=100,
+        help="Flat stake per pick (default: 100)"
+    )
+    parser.add_argument(
+        "--bankroll",
+        type=positive_float,
+        default=1000,
+        help="Starting bankroll for strategy simulations (default: 1000)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Update stats from the {EVENT_LOG_FILE} event log and checkpoint instead of a full rebuild"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a long-lived analytics daemon instead of a one-off export"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port for the local dashboard server or --daemon (default: 8000)"
+    )
+    parser.add_argument(
+        "--export-html",
+        nargs="?",
+        const=HTML_EXPORT_FILE,
+        metavar="PATH",
+        help=f"Write a self-contained dashboard (default: {HTML_EXPORT_FILE}) instead of starting the server"
+    )
+    parser.add_argument(
+        "--backtest",
+        nargs="+",
+        metavar="SEASON_DIR",
+        help="Walk-forward backtest over season directories holding cached data, then exit"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for --backtest (default: CPU count)"
+    )
+    parser.add_argument(
+        "--market-analysis",
+        action="store_true",
+        help="Print consensus vs. contrarian market analysis and exit"
+    )
+    parser.add_argument(
+        "--what-if-bets",
+        type=positive_float,
+        nargs="+",
+        metavar="AMOUNT",
+        help="Print flat-stake results for each bet amount and exit"
+    )
+    parser.add_argument(
+        "--what-if-bankrolls",
+        type=positive_float,
+        nargs="+",
+        metavar="BANKROLL",
+        help="Print strategy results for each starting bankroll and exit"
+    )
     args = parser.parse_args()
     refetch = args.refetch
     
+    API_BASE_URL = args.api_base.rstrip("/")
+    
+    if args.backtest:
+        report = walk_forward_backtest(args.backtest, args.bankroll, args.bet_amount, workers=args.workers)
+        print_backtest_report(report)
+        return
+    
     member, all_weeks = get_data(refetch=refetch)
     
-    print("\nCalculating betting results...")
-    stats = analyze_picks(member, all_weeks)
+    if args.daemon:
+        run_daemon(args.port, bet_amount=args.bet_amount, starting_bankroll=args.bankroll)
+        return
+    
+    if args.market_analysis:
+        print_market_analysis(calculate_market_analysis(resolve_picks(member, all_weeks)))
+        return
     
-    print_summary(stats)
+    if args.what_if_bets or args.what_if_bankrolls:
+        what_if = build_what_if(member, all_weeks)
+        print_what_if(
+            what_if,
+            args.what_if_bets or [args.bet_amount],
+            args.what_if_bankrolls or [args.bankroll]
+        )
+        return
     
-    print("\nExporting stats to JSON...")
-    json_file = export_stats_to_json(stats, member, all_weeks)
+    if args.incremental:
+        print("\nUpdating betting results from event log...")
+        state = update_incremental(member, all_weeks, args.bet_amount, args.bankroll)
+        
+        print_summary(stats_from_state(state))
+        
+        print("\nExporting stats to JSON...")
+        json_file = export_stats_from_state(state)
+    else:
+        print("\nCalculating betting results...")
+        resolved = resolve_picks(member, all_weeks)
+        stats = analyze_picks(member, all_weeks, args.bet_amount, resolved)
+        
+        print_summary(stats)
+        
+        print("\nExporting stats to JSON...")
+        json_file = export_stats_to_json(stats, member, all_weeks, args.bet_amount, args.bankroll, resolved)
     print(f"✓ Stats exported to: {json_file}")
+    
+    if args.export_html:
+        html_file = export_html(json_file, args.export_html)
+        print(f"✓ Dashboard exported to: {html_file}")
+        webbrowser.open('file://' + os.path.abspath(html_file))
+        return
 
     print("\nStarting local server...")
-    PORT = 8000
+    PORT = args.port
     webbrowser.open(f'http://localhost:{PORT}/dashboard.html')
 
     # Start server (this will block)
@@ -0,0 +1,221 @@
+"""
+Local stand-in for the ESPN gambit API.
+
+Serves recorded (the BetKeeper cache files) or synthetic payloads for the two
+endpoints betkeeper.py fetches, with optional latency, injected errors,
+throttling and cookie checks so the fetch path can be load and fault tested
+without a network connection.
+
+    python mock_espn_api.py --port 8001 --latency 200 --error-rate 0.1
+    python betkeeper.py --refetch --api-base http://localhost:8001/apis/v1
+"""
+import json
+import math
+import os
+import random
+import argparse
+import threading
+import time
+import http.server
+from urllib.parse import urlparse, parse_qs
+
+CHALLENGE_ID = 265
+MEMBER_FILE = "member_data.json"
+WEEKS_FILE = "all_weeks_data.json"
+
+BETTING_LINES = [-450, -300, -250, -200, -180, -150, -130, -120, -110,
+                 110, 120, 130, 150, 180, 199, 200, 250, 350]
+
+
+def load_recorded_payloads(member_file=MEMBER_FILE, weeks_file=WEEKS_FILE):
+    """Load recorded member and weeks payloads from BetKeeper cache files."""
+    with open(member_file) as f:
+        member = json.load(f)
+
+    with open(weeks_file) as f:
+        all_weeks = json.load(f)
+
+    return member, {str(week): data for week, data in all_weeks.items()}
+
+
+def generate_synthetic_payloads(weeks=18, games_per_week=14, seed=0):
+    """Generate member and weeks payloads shaped like the gambit API responses."""
+    rng = random.Random(seed)
+    all_weeks = {}
+    picks = []
+    prop_id = 0
+
+    for week in range(1, weeks + 1):
+        propositions = []
+        for _ in range(games_per_week):
+            prop_id += 1
+            line = rng.choice(BETTING_LINES)
+            other_line = -line if abs(line) >= 110 else 110
+            share = rng.uniform(0.2, 0.8)
+            outcomes = [
+                {"id": prop_id * 10 + 1, "mappings": [{"type": "BETTING_LINE", "value": str(line)}],
+                 "choiceCounters": [{"count": int(share * 10000)}]},
+                {"id": prop_id * 10 + 2, "mappings": [{"type": "BETTING_LINE", "value": str(other_line)}],
+                 "choiceCounters": [{"count": int((1 - share) * 10000)}]}
+            ]
+            propositions.append({"id": prop_id, "scoringPeriodId": week, "possibleOutcomes": outcomes})
+
+            picked = rng.choice(outcomes)
+            result = "CORRECT" if rng.random() < 0.55 else "INCORRECT"
+            picks.append({
+                "propositionId": prop_id,
+                "outcomesPicked": [{"outcomeId": picked["id"], "result": result}]
+            })
+        all_weeks[str(week)] = {"id": CHALLENGE_ID, "propositions": propositions}
+
+    member = {
+        "entries": [{
+            "picks": picks,
+            "score": {"scoreByPeriod": {str(week): {"score": games_per_week} for week in range(1, weeks + 1)}}
+        }]
+    }
+    return member, all_weeks
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to throttle requests."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Take one token; return 0 on success or the seconds until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class MockESPNHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the members and scoringPeriodId matchups endpoints."""
+
+    # Populated by make_server
+    member = None
+    all_weeks = None
+    config = None
+    bucket = None
+    rng = None
+
+    def do_GET(self):
+        config = self.config
+
+        if config.latency or config.jitter:
+            time.sleep(max(0, config.latency + self.rng.uniform(-config.jitter, config.jitter)) / 1000)
+
+        if self.bucket is not None:
+            wait = self.bucket.take()
+            if wait:
+                self.send_json(429, {"error": "Too Many Requests"}, {"Retry-After": str(math.ceil(wait))})
+                return
+
+        if config.error_rate and self.rng.random() < config.error_rate:
+            self.send_json(config.error_status, {"error": "Injected failure"})
+            return
+
+        if config.swid and f"SWID={config.swid}" not in self.headers.get("Cookie", ""):
+            self.send_json(401, {"error": "Unauthorized"})
+            return
+
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/")
+        query = parse_qs(parsed.query)
+        challenge_path = f"{config.prefix}/challenges/{CHALLENGE_ID}"
+
+        if path == f"{challenge_path}/members":
+            self.send_json(200, self.member)
+        elif path == challenge_path and "scoringPeriodId" in query:
+            week = self.all_weeks.get(query["scoringPeriodId"][0])
+            if week is None:
+                self.send_json(404, {"error": "Unknown scoringPeriodId"})
+            else:
+                self.send_json(200, week)
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.config.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(member, all_weeks, config):
+    """Build a threaded mock API server for the given payloads and fault config."""
+    handler = type("ConfiguredMockESPNHandler", (MockESPNHandler,), {
+        "member": member,
+        "all_weeks": {str(week): data for week, data in all_weeks.items()},
+        "config": config,
+        "bucket": TokenBucket(config.rate_limit, config.burst) if config.rate_limit else None,
+        "rng": random.Random(config.seed)
+    })
+    return http.server.ThreadingHTTPServer((config.host, config.port), handler)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local mock of the ESPN gambit API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8001, help="Port to listen on (default: 8001)")
+    parser.add_argument("--prefix", default="/apis/v1", help="URL path prefix (default: /apis/v1)")
+    parser.add_argument("--member-file", default=MEMBER_FILE, help="Recorded member payload")
+    parser.add_argument("--weeks-file", default=WEEKS_FILE, help="Recorded weeks payload")
+    parser.add_argument("--synthetic", type=int, metavar="WEEKS",
+                        help="Serve synthetic payloads for this many weeks instead of recorded files")
+    parser.add_argument("--games-per-week", type=int, default=14, help="Games per synthetic week (default: 14)")
+    parser.add_argument("--latency", type=float, default=0, help="Added latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Random +/- latency jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code for injected failures")
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="Requests per second before answering 429 (default: unlimited)")
+    parser.add_argument("--burst", type=int, default=5, help="Burst size for --rate-limit (default: 5)")
+    parser.add_argument("--swid", help="Answer 401 unless the SWID cookie matches this value")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic data and fault injection")
+    parser.add_argument("--quiet", action="store_true", help="Do not log each request")
+    return parser.parse_args(argv)
+
+
+def main():
+    config = parse_args()
+    config.prefix = "/" + config.prefix.strip("/") if config.prefix.strip("/") else ""
+
+    if config.synthetic:
+        member, all_weeks = generate_synthetic_payloads(config.synthetic, config.games_per_week, config.seed)
+        print(f"Serving synthetic data for {config.synthetic} weeks")
+    elif os.path.exists(config.member_file) and os.path.exists(config.weeks_file):
+        member, all_weeks = load_recorded_payloads(config.member_file, config.weeks_file)
+        print(f"Serving recorded data from {config.member_file} and {config.weeks_file}")
+    else:
+        raise SystemExit("No recorded payloads found. Run betkeeper.py once or pass --synthetic WEEKS.")
+
+    with make_server(member, all_weeks, config) as httpd:
+        print(f"Mock ESPN API running at http://{config.host}:{config.port}{config.prefix}")
+        print("Press Ctrl+C to stop the server")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopping mock server...")
+
+
+if __name__ == "__main__":
+    main()